@@ -0,0 +1,60 @@
+"""Micro-benchmark: compiled rule engine vs has_exactly_three_distinct_digits.
+
+Run it with:
+    python benchmarks/rules_bench.py --count 2000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bryan import has_exactly_three_distinct_digits
+from rules import compile_rules
+
+def time_call(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the rule engine with the per-number check")
+    parser.add_argument("--count", type=int, default=2000000, help="Synthetic numbers to score")
+    parser.add_argument("--batch-size", type=int, default=0, help="Score in batches of this size (0 scores everything at once)")
+    parser.add_argument("--rules", default=None, help="Extra rule spec to time on its own (e.g. 'distinct<=4*2,run>=3,palindrome')")
+    parser.add_argument("--seed", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    numbers = rng.integers(80000000, 100000000, size=args.count, dtype=np.int64)
+    number_list = numbers.tolist()
+    required_digits = int(os.getenv('REQUIRED_DISTINCT_DIGITS', 3))
+    print(f"Scoring {args.count:,} synthetic numbers for exactly {required_digits} distinct digits")
+
+    legacy, legacy_time = time_call(lambda: [has_exactly_three_distinct_digits(number) for number in number_list])
+
+    number_rules = compile_rules(f"distinct={required_digits}")
+    if args.batch_size:
+        batches = range(0, args.count, args.batch_size)
+        compiled, compiled_time = time_call(lambda: np.concatenate(
+            [number_rules.match_batch(numbers[start:start + args.batch_size]) for start in batches]
+        ))
+    else:
+        compiled, compiled_time = time_call(lambda: number_rules.match_batch(numbers))
+
+    if not np.array_equal(np.array(legacy, dtype=bool), compiled):
+        print("ERROR: The rule engine and has_exactly_three_distinct_digits disagree")
+        sys.exit(1)
+
+    print(f"has_exactly_three_distinct_digits: {legacy_time:.3f}s ({args.count / legacy_time:,.0f} numbers/s)")
+    print(f"compiled rules:                    {compiled_time:.3f}s ({args.count / compiled_time:,.0f} numbers/s)")
+    print(f"Speed-up: {legacy_time / compiled_time:.1f}x, {int(compiled.sum()):,} matches")
+
+    if args.rules:
+        extra_rules = compile_rules(args.rules)
+        scores, extra_time = time_call(lambda: extra_rules.score_batch(numbers))
+        print(f"\n{extra_rules.describe()}")
+        print(f"Scored in {extra_time:.3f}s ({args.count / extra_time:,.0f} numbers/s), best score {scores.max():g}")
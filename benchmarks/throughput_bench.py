@@ -0,0 +1,181 @@
+"""End-to-end throughput benchmark: runs the search in headless Chromium against the local fixture server.
+
+Record a baseline once, then run it after each change; it exits with status 1 if numbers examined
+per second, time to first match or memory per 1,000 batches got worse than the baseline allows:
+
+    python benchmarks/throughput_bench.py --update-baseline
+    python benchmarks/throughput_bench.py
+
+Needs Chromium for Playwright (playwright install chromium).
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the benchmark away from the real run's seen-number index, metrics, storage state and checkpoint
+os.environ.update(SEEN_INDEX_PATH='', METRICS_JSON_PATH='', METRICS_PROM_PATH='', STORAGE_STATE_PATH='', CHECKPOINT_PATH='')
+
+# Settings that change throughput or time to first match are pinned, so a developer's .env
+# can't make results incomparable with the baseline. They are saved with the baseline too.
+PINNED_SETTINGS = {
+    'LOAD_WAIT_MODE': 'dom',
+    'LOAD_TIMEOUT': '10000',
+    'LOAD_WAIT_TIME': '3',
+    'PAGE_TIMEOUT': '60000',
+    'CAPTURE_MODE': 'dom',
+    'PACING_MODE': 'off',
+    'BLOCK_RESOURCES': '0',
+}
+os.environ.update(PINNED_SETTINGS)
+
+from playwright.sync_api import sync_playwright
+
+import bryan
+import fixture_server
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Result name -> whether a higher value is better
+RESULTS = {
+    "numbers_per_second": True,
+    "time_to_first_match": False,
+    "memory_mb_per_1000_batches": False,
+}
+CONFIG_KEYS = ("batches", "batch_size", "latency", "jitter", "density", "match_digits", "append", "extraction_mode", "seed")
+
+def process_tree_rss_mb():
+    """Resident memory of this process and its children (the Playwright driver and Chromium) in MB"""
+    process = psutil.Process()
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / 1024 / 1024
+
+def run_benchmark(args):
+    server = fixture_server.start_in_background(
+        batch_size=args.batch_size, pages=args.batches + 10, seed=args.seed, latency=args.latency,
+        jitter=args.jitter, density=args.density, match_digits=args.match_digits, append=args.append
+    )
+    url = f"http://127.0.0.1:{server.server_address[1]}/activation/choose-number"
+    os.environ['TARGET_URL'] = url
+    os.environ['NUMBER_RULES'] = f"distinct={args.match_digits}"
+    os.environ['EXTRACTION_MODE'] = args.extraction_mode
+    number_rules = bryan.get_number_rules()
+
+    examined = 0
+    batches = 0
+    first_match = None
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.goto(url)
+        memory_start = process_tree_rss_mb()
+
+        output = sys.stdout if args.verbose else open(os.devnull, 'w')
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            for numbers in bryan.iter_number_batches(page, args.batches):
+                batches += 1
+                examined += len(numbers)
+                scores = bryan.score_numbers(numbers)
+                if first_match is None and (scores >= number_rules.min_score).any():
+                    first_match = time.perf_counter() - start
+        elapsed = time.perf_counter() - start
+
+        memory_end = process_tree_rss_mb()
+        browser.close()
+    server.shutdown()
+
+    return {
+        "batches": batches,
+        "numbers_examined": examined,
+        "seconds": round(elapsed, 3),
+        "numbers_per_second": round(examined / elapsed, 1) if elapsed else 0,
+        "time_to_first_match": round(first_match, 3) if first_match is not None else None,
+        "memory_mb_per_1000_batches": round((memory_end - memory_start) / batches * 1000, 2) if batches else None,
+        "memory_mb_end": round(memory_end, 1),
+    }
+
+def find_regressions(results, baseline, max_regression, memory_slack_mb):
+    """Return a message for every result that is worse than the baseline allows"""
+    regressions = []
+    for name, higher_is_better in RESULTS.items():
+        current = results.get(name)
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if current is None:
+            # e.g. no match at all where the baseline found one
+            regressions.append(f"{name} has no value (baseline {expected})")
+            continue
+        if higher_is_better:
+            limit = expected * (1 - max_regression)
+            if current < limit:
+                regressions.append(f"{name} dropped to {current} (baseline {expected}, limit {limit:.2f})")
+        else:
+            # Memory growth is small and noisy, so it gets an absolute allowance on top
+            slack = memory_slack_mb if name.startswith("memory") else 0
+            limit = max(expected, 0) * (1 + max_regression) + slack
+            if current > limit:
+                regressions.append(f"{name} rose to {current} (baseline {expected}, limit {limit:.2f})")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the search against the local fixture server")
+    parser.add_argument("--batches", type=int, default=200, help="Batches to load")
+    parser.add_argument("--batch-size", type=int, default=24, help="Numbers per batch")
+    parser.add_argument("--latency", type=float, default=0.05, help="Server response time in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Random +/- seconds added to the latency")
+    parser.add_argument("--density", type=float, default=0.01, help="Fraction of numbers that match")
+    parser.add_argument("--match-digits", type=int, default=3, help="Distinct digits of a matching number")
+    parser.add_argument("--append", action="store_true", help="Append batches on the page instead of replacing them")
+    parser.add_argument("--extraction-mode", default="batch", choices=("batch", "per-element", "incremental"),
+                        help="EXTRACTION_MODE to benchmark (try incremental with --append)")
+    parser.add_argument("--seed", type=int, default=8)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results file")
+    parser.add_argument("--update-baseline", action="store_true", help="Save these results as the new baseline")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed fraction worse than the baseline")
+    parser.add_argument("--memory-slack-mb", type=float, default=5.0, help="Extra MB per 1,000 batches allowed before failing")
+    parser.add_argument("--verbose", action="store_true", help="Show the search output")
+    args = parser.parse_args()
+
+    config = {key: getattr(args, key) for key in CONFIG_KEYS}
+    config["settings"] = PINNED_SETTINGS
+    print(f"Running {args.batches} batches of {args.batch_size} numbers "
+          f"({args.latency}s +/- {args.jitter}s latency, {args.density:.1%} matches)...")
+    results = run_benchmark(args)
+    for name, value in results.items():
+        print(f"{name:>28}: {value}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({"config": config, **results}, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one")
+        sys.exit(0)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print(f"\nWarning: The baseline was recorded with different settings: {baseline.get('config')}")
+
+    regressions = find_regressions(results, baseline, args.max_regression, args.memory_slack_mb)
+    if regressions:
+        print("\nREGRESSION:")
+        for message in regressions:
+            print(f"- {message}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline")
@@ -1,15 +1,134 @@
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
+import asyncio
 import time
 import os
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 import psutil
 import shutil
+import json
+import re
+import heapq
+import itertools
+import argparse
+import signal
+import sys
+import threading
+import contextlib
+from datetime import datetime, timezone
+from rules import compile_rules
+from seen_index import SeenIndex, get_pool_size
+from metrics import get_metrics
+from pacing import get_pacing, get_active_pacing
+from checkpoint import get_checkpoint, start_checkpoint
 
 # Load environment variables
 load_dotenv()
 
+EXTRACT_NUMBERS_JS = """buttons => buttons.map(button => {
+    const markdown = button.querySelector('div.markdown');
+    return markdown ? markdown.innerText : null;
+})"""
+
+NUMBERS_SIGNATURE_JS = """() => Array.from(
+    document.querySelectorAll('div[orientation="horizontal"] button div.markdown'),
+    markdown => markdown.innerText
+).join(',')"""
+
+# Returns the text of every number that appeared since the last call. The first call installs a
+# MutationObserver that queues number elements as they are added or their text changes (pages that
+# update buttons in place only change text nodes), and numbers are deduplicated by text, so each
+# call only reads the new numbers no matter how many are already on the page.
+DRAIN_NEW_NUMBERS_JS = """() => {
+    const selector = 'div[orientation="horizontal"] button div.markdown';
+    // Texts remembered for deduplication; the oldest are forgotten past this many
+    const maxReturned = 5000;
+    let state = window.__eightNewNumbers;
+    if (!state) {
+        state = window.__eightNewNumbers = {queue: new Set(), held: new Set(), returned: new Set()};
+        // Text changes only look upwards, so unrelated text elsewhere never rescans the page
+        const enqueueText = node => {
+            const markdown = node.parentElement && node.parentElement.closest(selector);
+            if (markdown) state.queue.add(markdown);
+        };
+        const enqueueElement = element => {
+            const markdown = element.closest(selector);
+            if (markdown) state.queue.add(markdown);
+            element.querySelectorAll(selector).forEach(markdown => state.queue.add(markdown));
+        };
+        document.querySelectorAll(selector).forEach(markdown => state.queue.add(markdown));
+        new MutationObserver(mutations => {
+            for (const mutation of mutations) {
+                if (mutation.type === 'characterData') {
+                    enqueueText(mutation.target);
+                    continue;
+                }
+                for (const node of mutation.addedNodes) {
+                    if (node.nodeType === Node.ELEMENT_NODE) enqueueElement(node);
+                    else enqueueText(node);
+                }
+            }
+        }).observe(document.body, {childList: true, subtree: true, characterData: true});
+    }
+    const queued = [...state.held, ...state.queue];
+    state.held = new Set();
+    state.queue = new Set();
+    const texts = [];
+    for (const markdown of queued) {
+        const text = markdown.innerText;
+        if (text && !state.returned.has(text)) {
+            state.returned.add(text);
+            texts.push(text);
+        }
+    }
+    for (const text of state.returned) {
+        if (state.returned.size <= maxReturned) break;
+        state.returned.delete(text);
+    }
+    return texts;
+}"""
+
+# Called just before a click, so the pending check below only sees what the click brings in.
+# Anything queued since the last drain is held back for the next drain rather than dropped.
+HOLD_NEW_NUMBERS_JS = """() => {
+    const state = window.__eightNewNumbers;
+    if (!state) return;
+    state.queue.forEach(markdown => state.held.add(markdown));
+    state.queue = new Set();
+}"""
+
+NEW_NUMBERS_PENDING_JS = """() => {
+    const state = window.__eightNewNumbers;
+    if (!state) return false;
+    for (const markdown of state.queue) {
+        const text = markdown.innerText;
+        if (text && !state.returned.has(text)) return true;
+    }
+    return false;
+}"""
+
+NUMBER_SHOWN_JS = """number => Array.from(
+    document.querySelectorAll('div[orientation="horizontal"] button div.markdown'),
+    markdown => markdown.innerText.trim()
+).includes(number)"""
+
+NUMBERS_CHANGED_JS = """previous => {
+    const markdowns = document.querySelectorAll('div[orientation="horizontal"] button div.markdown');
+    if (markdowns.length === 0) return false;
+    return Array.from(markdowns, markdown => markdown.innerText).join(',') !== previous;
+}"""
+
+# Signs that the site is showing a human verification challenge instead of the numbers
+VERIFICATION_JS = """() => {
+    if (document.querySelector('iframe[src*="captcha"], iframe[src*="challenge"], #challenge-form, [id*="captcha"]')) return true;
+    return /verify you are human|are you a robot|unusual traffic/i.test((document.body && document.body.innerText || '').slice(0, 5000));
+}"""
+
 def kill_chrome_processes():
     """Kill all existing Chrome processes"""
     try:
@@ -17,26 +136,56 @@ def kill_chrome_processes():
             subprocess.run(['taskkill', '/F', '/IM', 'chrome.exe'], capture_output=True)
         else:  # Linux/Mac
             subprocess.run(['pkill', 'chrome'], capture_output=True)
-        time.sleep(2)  # Wait for processes to close
+        # Wait for the processes to close, for at most 2 seconds
+        deadline = time.time() + 2
+        while time.time() < deadline and any('chrome' in (process.info['name'] or '').lower() for process in psutil.process_iter(['name'])):
+            time.sleep(0.1)
     except Exception as e:
         print(f"Warning: Could not kill Chrome processes: {e}")
 
+def is_chrome_debugger_running():
+    """Check whether something is already answering on the Chrome debugging port"""
+    try:
+        response = requests.get(f"http://localhost:{os.getenv('CHROME_DEBUG_PORT', 9222)}/json/version", timeout=1)
+        return response.status_code == 200
+    except requests.RequestException:
+        return False
+
 def wait_for_chrome_debugger():
+    """Poll the Chrome debugging port with short, exponentially growing delays"""
     print("Waiting for Chrome debugger to be ready...")
     max_attempts = int(os.getenv('MAX_DEBUG_ATTEMPTS', 10))
+    max_delay = float(os.getenv('DEBUG_WAIT_TIME', 2))
+    delay = 0.1
     for attempt in range(max_attempts):
-        try:
-            response = requests.get(f"http://localhost:{os.getenv('CHROME_DEBUG_PORT', 9222)}/json/version")
-            if response.status_code == 200:
-                print("Chrome debugger is ready!")
-                return True
-        except:
-            print(f"Attempt {attempt + 1}/{max_attempts}: Waiting for Chrome debugger...")
-            time.sleep(int(os.getenv('DEBUG_WAIT_TIME', 2)))
+        if is_chrome_debugger_running():
+            print("Chrome debugger is ready!")
+            return True
+        print(f"Attempt {attempt + 1}/{max_attempts}: Waiting for Chrome debugger...")
+        if attempt < max_attempts - 1:
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
     return False
 
 def find_chrome_path():
-    """Find Chrome installation path on Windows"""
+    """Find the Chrome installation path. On Linux and Mac, falls back to the Chromium bundled with Playwright."""
+    if os.name != 'nt':
+        for name in ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser'):
+            path = shutil.which(name)
+            if path:
+                print(f"Found Chrome at: {path}")
+                return path
+        try:
+            with sync_playwright() as p:
+                path = p.chromium.executable_path
+            if os.path.exists(path):
+                print(f"Using Playwright's Chromium at: {path}")
+                return path
+        except Exception as e:
+            print(f"Warning: Could not find Playwright's Chromium: {e}")
+        print("Chrome not found. Install it or run: playwright install chromium")
+        return None
+    
     possible_paths = [
         r"C:\Program Files\Google\Chrome\Application\chrome.exe",
         r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
@@ -53,9 +202,63 @@ def find_chrome_path():
     print("Chrome not found in common installation paths.")
     return None
 
-def launch_chrome_with_debugging():
-    # Kill existing Chrome processes
-    kill_chrome_processes()
+def save_storage_state(context):
+    """Save the cookies and local storage of a browser context so they survive restarts"""
+    path = os.getenv('STORAGE_STATE_PATH', 'storage-state.json')
+    if not path:
+        return
+    try:
+        context.storage_state(path=path)
+        print(f"Saved browser storage state to {path}")
+    except Exception as e:
+        print(f"Warning: Could not save browser storage state: {e}")
+
+def open_target_page(restore_state=False):
+    """Send the first tab of the debug Chrome instance to TARGET_URL. With restore_state the saved
+    cookies and local storage are loaded first; the navigation has to happen while still connected,
+    since it is what writes the local storage. Returns True if the state was restored."""
+    path = os.getenv('STORAGE_STATE_PATH', 'storage-state.json')
+    state = None
+    try:
+        if restore_state and path and os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+        with sync_playwright() as p:
+            browser = p.chromium.connect_over_cdp(f"http://localhost:{os.getenv('CHROME_DEBUG_PORT', 9222)}")
+            context = browser.contexts[0]
+            if state is not None:
+                context.add_cookies(state.get('cookies', []))
+                # Local storage can only be set from inside the page. The init script only lives as
+                # long as this connection, so it is applied by the navigation below.
+                origins = {origin['origin']: origin.get('localStorage', []) for origin in state.get('origins', [])}
+                context.add_init_script(f"""(() => {{
+                    const items = {json.dumps(origins)}[location.origin] || [];
+                    for (const item of items) {{
+                        if (localStorage.getItem(item.name) === null) localStorage.setItem(item.name, item.value);
+                    }}
+                }})()""")
+            page = context.pages[0] if context.pages else context.new_page()
+            page.goto(os.getenv('TARGET_URL', 'https://account.eight.com.sg/activation/choose-number'))
+        if state is not None:
+            print(f"Restored browser storage state from {path}")
+        return state is not None
+    except Exception as e:
+        print(f"Warning: Could not open the number selection page: {e}")
+        return False
+
+def launch_chrome_with_debugging(interactive=True):
+    """Start Chrome with remote debugging, reusing an instance that is already running.
+    If interactive is False nothing is asked; the saved storage state is used instead of manual verification."""
+    fresh_profile = os.getenv('FRESH_CHROME_PROFILE', '0') == '1'
+    
+    # Reuse a debug instance that is already listening, together with its profile and verification
+    if not fresh_profile and is_chrome_debugger_running():
+        print("Chrome is already running with remote debugging enabled, reusing it")
+        return True
+    
+    # Kill existing Chrome processes only when asked to
+    if fresh_profile or os.getenv('KILL_CHROME_ON_LAUNCH', '0') == '1':
+        kill_chrome_processes()
     
     # Find Chrome installation path
     chrome_path = find_chrome_path()
@@ -67,13 +270,16 @@ def launch_chrome_with_debugging():
         return False
     
     try:
-        # Create unique user data directory
+        # Keep the debug profile between launches unless a fresh one is asked for
         user_data_dir = os.path.join(os.getcwd(), "chrome-debug-profile")
-        if os.path.exists(user_data_dir):
+        if fresh_profile and os.path.exists(user_data_dir):
             shutil.rmtree(user_data_dir)
+        # A kept profile already has newer cookies than the saved state, so only restore into a new one,
+        # and never into one that was deliberately wiped for a clean start
+        restore_state = not fresh_profile and not os.path.exists(user_data_dir)
         
-        # Launch Chrome with more options for stability and open eight.com.sg
-        subprocess.Popen([
+        headless = os.getenv('CHROME_HEADLESS', '0') == '1'
+        chrome_args = [
             chrome_path,
             f"--remote-debugging-port={os.getenv('CHROME_DEBUG_PORT', 9222)}",
             f"--user-data-dir={user_data_dir}",
@@ -98,16 +304,13 @@ def launch_chrome_with_debugging():
             "--metrics-recording-only",
             "--no-sandbox",
             "--safebrowsing-disable-auto-update",
-            "https://www.eight.com.sg/"  # Add the URL to open
-        ])
+        ]
+        if headless:
+            chrome_args.append("--headless=new")
         
-        print("Chrome launched with remote debugging enabled and navigating to eight.com.sg")
-        print("\nPlease complete the following steps:")
-        print(f"1. Navigate to {os.getenv('TARGET_URL', 'https://account.eight.com.sg/activation/choose-number')}")
-        print("2. Complete any human verification if needed")
-        print("3. Get to the page with the numbers")
-        print("4. Press Enter when ready to start the script")
-        input()
+        # Launch Chrome with more options for stability and open eight.com.sg
+        subprocess.Popen(chrome_args + ["https://www.eight.com.sg/"])
+        print(f"Chrome launched{' headless' if headless else ''} with remote debugging enabled and navigating to eight.com.sg")
         
         # Wait for Chrome debugger with better error handling
         if not wait_for_chrome_debugger():
@@ -117,6 +320,17 @@ def launch_chrome_with_debugging():
             print("3. Delete the chrome-debug-profile folder")
             print("4. Try running the script again")
             return False
+        
+        # Unattended runs always need the target page; interactive ones only get it with a restored session
+        if restore_state or not interactive:
+            open_target_page(restore_state=restore_state)
+        if interactive:
+            print("\nPlease complete the following steps:")
+            print(f"1. Navigate to {os.getenv('TARGET_URL', 'https://account.eight.com.sg/activation/choose-number')}")
+            print("2. Complete any human verification if needed")
+            print("3. Get to the page with the numbers")
+            print("4. Press Enter when ready to start the script")
+            input()
             
         return True
     except Exception as e:
@@ -134,8 +348,491 @@ def has_exactly_three_distinct_digits(number):
     required_digits = int(os.getenv('REQUIRED_DISTINCT_DIGITS', 3))
     return unique_digits == required_digits
 
+_number_rules = None
+
+def get_number_rules():
+    """Return the number rules, compiled from NUMBER_RULES on first use"""
+    global _number_rules
+    if _number_rules is None:
+        _number_rules = compile_rules()
+    return _number_rules
+
+_seen_index = None
+
+def get_seen_index():
+    """Return the seen-number index, opened on first use, or None if SEEN_INDEX_PATH is empty"""
+    global _seen_index
+    path = os.getenv('SEEN_INDEX_PATH', 'seen_numbers.db')
+    if _seen_index is None and path:
+        _seen_index = SeenIndex(path)
+    return _seen_index
+
+def skip_seen_numbers(numbers):
+    """Drop the numbers already examined and rejected under the current rules in this or an earlier run"""
+    seen_index = get_seen_index()
+    if seen_index is None or not numbers:
+        return numbers
+    number_rules = get_number_rules()
+    new_numbers, seen_before = seen_index.filter_new(numbers, number_rules.key(), number_rules.min_score)
+    if seen_before == len(numbers):
+        print(f"All {len(numbers)} numbers were examined before, this batch was re-served")
+    if len(new_numbers) < len(numbers):
+        print(f"Skipping {len(numbers) - len(new_numbers)} numbers examined before")
+    return new_numbers
+
+def get_known_scores(numbers):
+    """Return the stored scores of the numbers already scored under the current rules, as a dict"""
+    seen_index = get_seen_index()
+    if seen_index is None or not numbers:
+        return {}
+    scores, _ = seen_index.lookup(numbers, get_number_rules().key())
+    return scores
+
+def score_numbers(numbers):
+    """Score a batch of numbers with the number rules and record them in the seen-number index"""
+    number_rules = get_number_rules()
+    scores = number_rules.score_batch(numbers)
+    seen_index = get_seen_index()
+    if seen_index is not None and len(numbers):
+        seen_index.record(numbers, scores, number_rules.key())
+    return scores
+
+def report_seen_coverage():
+    """Print how much of the number pool has been examined across all runs"""
+    seen_index = get_seen_index()
+    if seen_index is not None:
+        seen, fraction = seen_index.coverage(get_pool_size())
+        print(f"Seen {seen:,} of {get_pool_size():,} possible numbers so far ({fraction:.4%})")
+
+def report_pacing():
+    """Print where adaptive pacing ended up, if any click was paced"""
+    pacing = get_active_pacing()
+    if pacing is not None:
+        print(pacing.summary())
+
+def record_error(error):
+    """Count an error in the run metrics, keeping timeouts separate"""
+    get_metrics().inc('timeouts' if isinstance(error, PlaywrightTimeoutError) else 'errors')
+
+def parse_number_texts(texts):
+    """Convert the raw button texts into numbers, skipping anything that isn't one"""
+    numbers = []
+    for text in texts:
+        if text is None:
+            continue
+        try:
+            numbers.append(int(text))
+        except ValueError:
+            print(f"Error processing button text: {text!r}")
+    return numbers
+
+def extract_numbers_batch(page):
+    """Extract every number in the button container with a single in-page evaluation.
+    Returns the numbers and the number of CDP round trips used."""
+    texts = page.eval_on_selector_all('div[orientation="horizontal"] button', EXTRACT_NUMBERS_JS)
+    return parse_number_texts(texts), 1
+
+def extract_numbers_per_element(page):
+    """Extract the numbers one button at a time (two round trips per button).
+    Returns the numbers and the number of CDP round trips used."""
+    buttons = page.query_selector_all('div[orientation="horizontal"] button')
+    round_trips = 1
+    texts = []
+    for button in buttons:
+        try:
+            # Get the number from the markdown div inside the button
+            markdown_div = button.query_selector('div.markdown')
+            round_trips += 1
+            if markdown_div:
+                texts.append(markdown_div.inner_text())
+                round_trips += 1
+        except Exception as e:
+            print(f"Error processing button: {e}")
+            continue
+    return parse_number_texts(texts), round_trips
+
+def extract_numbers_incremental(page):
+    """Extract only the numbers added since the last call, using an in-page MutationObserver queue.
+    Returns the numbers and the number of CDP round trips used."""
+    texts = page.evaluate(DRAIN_NEW_NUMBERS_JS)
+    return parse_number_texts(texts), 1
+
+def is_incremental_extraction():
+    return os.getenv('EXTRACTION_MODE', 'batch').lower() == 'incremental'
+
+def extract_numbers(page):
+    """Extract the numbers on the page using the configured EXTRACTION_MODE.
+    Returns the numbers, the round trips used and the time taken in seconds."""
+    mode = os.getenv('EXTRACTION_MODE', 'batch').lower()
+    start = time.perf_counter()
+    if mode == 'per-element':
+        numbers, round_trips = extract_numbers_per_element(page)
+    elif mode == 'incremental':
+        numbers, round_trips = extract_numbers_incremental(page)
+    else:
+        numbers, round_trips = extract_numbers_batch(page)
+    elapsed = time.perf_counter() - start
+    get_metrics().observe('extract', elapsed)
+    return numbers, round_trips, elapsed
+
+def get_numbers_signature(page):
+    """Return a string identifying the set of number buttons currently on the page"""
+    return page.evaluate(NUMBERS_SIGNATURE_JS)
+
+_warned_response_pattern = False
+
+def is_numbers_response(response):
+    """Check whether a network response is the one that delivers a new batch of numbers.
+    Without NUMBERS_RESPONSE_PATTERN any JSON XHR/fetch response is taken to be it."""
+    pattern = os.getenv('NUMBERS_RESPONSE_PATTERN', '')
+    if pattern:
+        return pattern in response.url
+    if response.request.resource_type not in ('xhr', 'fetch'):
+        return False
+    return 'json' in response.headers.get('content-type', '')
+
+def warn_without_response_pattern():
+    """Warn once that the numbers response is being guessed because NUMBERS_RESPONSE_PATTERN is unset"""
+    global _warned_response_pattern
+    if not os.getenv('NUMBERS_RESPONSE_PATTERN') and not _warned_response_pattern:
+        _warned_response_pattern = True
+        print("Warning: NUMBERS_RESPONSE_PATTERN is not set, so any JSON XHR/fetch response "
+              "(including analytics) is taken to be the numbers response")
+
+def wait_for_load_fallback(page):
+    """Wait for new numbers the old way: a fixed sleep followed by a selector check.
+    Returns the seconds spent on the selector check after the sleep."""
+    print("Waiting for new numbers to load...")
+    with get_metrics().time('load_wait'):
+        time.sleep(int(os.getenv('LOAD_WAIT_TIME', 3)))
+        start = time.perf_counter()
+        page.wait_for_selector('div[orientation="horizontal"] button', timeout=int(os.getenv('PAGE_TIMEOUT', 60000)))
+    return time.perf_counter() - start
+
+def is_verification_page(page):
+    """Check whether the page has left the number selection page or is showing a verification challenge"""
+    target_url = os.getenv('TARGET_URL', 'https://account.eight.com.sg/activation/choose-number')
+    if target_url not in page.url:
+        return True
+    try:
+        return page.evaluate(VERIFICATION_JS)
+    except Exception:
+        return False
+
+def record_load_failure(pacing, page, error):
+    """Tell the pacing controller why a batch didn't load"""
+    if is_verification_page(page):
+        print("Warning: The site is showing a verification challenge, complete it in Chrome")
+        pacing.record_verification()
+    elif isinstance(error, PlaywrightTimeoutError):
+        pacing.record_timeout()
+    else:
+        pacing.record_error(error)
+
+def click_show_more(page, mode=None, capture=None):
+    """Click "Show more numbers" and wait until the new numbers have arrived.
+    mode overrides LOAD_WAIT_MODE. Returns False if there is no button to click.
+    With a NumberResponseCapture in network/both mode it returns as soon as the numbers response
+    has been captured, so the caller can check the payload before the page renders it.
+    Clicks are spaced by the adaptive pacing controller when PACING_MODE=adaptive."""
+    show_more_button = page.query_selector('span:has-text("Show more numbers")')
+    if not show_more_button:
+        return False
+    pacing = get_pacing()
+    pacing.wait()
+    print("Clicking 'Show more numbers'...")
+    metrics = get_metrics()
+    
+    mode = (mode or os.getenv('LOAD_WAIT_MODE', 'dom')).lower()
+    if mode not in ('dom', 'network', 'both'):
+        with metrics.time('show_more_click'):
+            show_more_button.click()
+        print("Clicked 'Show more numbers'")
+        try:
+            # The fixed sleep says nothing about the site, so only the selector check counts as latency
+            latency = wait_for_load_fallback(page)
+        except Exception as e:
+            record_load_failure(pacing, page, e)
+            raise
+        if os.getenv('TARGET_URL', 'https://account.eight.com.sg/activation/choose-number') not in page.url:
+            print("Warning: The page navigated away from the number selection page")
+            pacing.record_verification()
+        else:
+            pacing.record_success(latency)
+        return True
+    
+    timeout = int(os.getenv('LOAD_TIMEOUT', 10000))
+    # Incremental extraction waits for its own queue instead of comparing every number on the page
+    incremental = is_incremental_extraction()
+    if incremental:
+        page.evaluate(HOLD_NEW_NUMBERS_JS)
+    previous_signature = None if incremental else get_numbers_signature(page)
+    clicked = False
+    start = time.perf_counter()
+    if mode in ('network', 'both'):
+        warn_without_response_pattern()
+    try:
+        if mode in ('network', 'both'):
+            with page.expect_response(is_numbers_response, timeout=timeout) as response_info:
+                with metrics.time('show_more_click'):
+                    show_more_button.click()
+                clicked = True
+                clicked_at = time.perf_counter()
+            print(f"Numbers response received after {time.perf_counter() - start:.3f}s")
+            if capture is not None:
+                # Hand the payload straight to the caller instead of waiting for the page to render it
+                capture.add(response_info.value)
+                metrics.observe('load_wait', time.perf_counter() - clicked_at)
+                pacing.record_success(time.perf_counter() - clicked_at)
+                return True
+        else:
+            with metrics.time('show_more_click'):
+                show_more_button.click()
+            clicked = True
+            clicked_at = time.perf_counter()
+        print("Clicked 'Show more numbers'")
+        
+        # The response alone doesn't mean the page shows the new numbers yet (and the old
+        # buttons are still there), so every mode waits for the numbers to actually change
+        if incremental:
+            # Resolves as soon as the MutationObserver has queued a number that hasn't been read yet
+            page.wait_for_function(NEW_NUMBERS_PENDING_JS, polling='mutation', timeout=timeout)
+        else:
+            # Resolves as soon as a DOM mutation changes the set of numbers
+            page.wait_for_function(
+                NUMBERS_CHANGED_JS,
+                arg=previous_signature,
+                polling='mutation',
+                timeout=timeout
+            )
+        metrics.observe('load_wait', time.perf_counter() - clicked_at)
+        print(f"New numbers loaded in {time.perf_counter() - start:.3f}s")
+        if os.getenv('TARGET_URL', 'https://account.eight.com.sg/activation/choose-number') not in page.url:
+            print("Warning: The page navigated away from the number selection page")
+            pacing.record_verification()
+        else:
+            pacing.record_success(time.perf_counter() - clicked_at)
+    except Exception as e:
+        if not clicked:
+            raise
+        record_error(e)
+        record_load_failure(pacing, page, e)
+        print(f"Warning: Could not detect new numbers ({e})")
+        print("Falling back to fixed wait...")
+        wait_for_load_fallback(page)
+    return True
+
+def parse_numbers_from_payload(payload):
+    """Pull every phone number out of a JSON payload fetched by the number selection page.
+    A value counts as a number if it sits under one of NUMBER_PAYLOAD_KEYS and is all digits."""
+    keys = {key.strip().lower() for key in os.getenv(
+        'NUMBER_PAYLOAD_KEYS', 'number,msisdn,phoneNumber,phone_number,mobileNumber,mobile_number'
+    ).split(',') if key.strip()}
+    numbers = []
+    seen = set()
+    
+    def walk(value, key):
+        if isinstance(value, dict):
+            for child_key, child in value.items():
+                walk(child, str(child_key).lower())
+        elif isinstance(value, list):
+            for child in value:
+                walk(child, key)
+        elif key in keys and isinstance(value, (str, int)) and not isinstance(value, bool):
+            text = re.sub(r'[\s-]', '', str(value))
+            if text.isdigit() and text not in seen:
+                seen.add(text)
+                numbers.append(int(text))
+    
+    walk(payload, None)
+    return numbers
+
+class NumberResponseCapture:
+    """Collects numbers from the responses the page fetches when "Show more numbers" is clicked"""
+    
+    def __init__(self, page):
+        self.page = page
+        self.pending = []
+        self.record_dir = os.getenv('CAPTURE_RECORD_DIR', '')
+        page.on("response", self._on_response)
+    
+    def _on_response(self, response):
+        # Only keep the response here, it is read when the search loop drains it
+        if is_numbers_response(response):
+            self.add(response)
+    
+    def add(self, response):
+        if response not in self.pending:
+            self.pending.append(response)
+    
+    def drain(self):
+        """Return the numbers from every response received since the last call"""
+        responses, self.pending = self.pending, []
+        numbers = []
+        for response in responses:
+            try:
+                payload = response.json()
+            except Exception as e:
+                print(f"Warning: Could not read response from {response.url}: {e}")
+                continue
+            if self.record_dir:
+                self.record(response, payload)
+            numbers.extend(parse_numbers_from_payload(payload))
+        return numbers
+    
+    def record(self, response, payload):
+        """Save a payload so it can be used as an offline fixture"""
+        os.makedirs(self.record_dir, exist_ok=True)
+        path = os.path.join(self.record_dir, f"response-{int(time.time() * 1000)}.json")
+        with open(path, 'w') as f:
+            json.dump({"url": response.url, "status": response.status, "payload": payload}, f, indent=2)
+        print(f"Recorded response to {path}")
+    
+    def close(self):
+        self.page.remove_listener("response", self._on_response)
+
+_response_captures = {}
+
+def get_response_capture(page):
+    """Return the response capture attached to a page, attaching one on first use"""
+    capture = _response_captures.get(id(page))
+    if capture is None or capture.page is not page:
+        capture = NumberResponseCapture(page)
+        _response_captures[id(page)] = capture
+    return capture
+
+# Rough transfer sizes used to estimate the bytes saved by blocked requests
+ESTIMATED_RESOURCE_BYTES = {
+    'image': 25000,
+    'font': 35000,
+    'media': 250000,
+    'stylesheet': 15000,
+    'script': 50000,
+}
+
+# File extensions blocked for each resource type. Chrome matches these itself, so blocking
+# never puts the page's own requests through Python.
+RESOURCE_TYPE_EXTENSIONS = {
+    'image': ('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico'),
+    'font': ('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': ('mp4', 'webm', 'mp3', 'ogg', 'wav', 'm4a'),
+    'stylesheet': ('css',),
+}
+
+class ResourceBlocker:
+    """Blocks the resources the search doesn't need on one page.
+    Resource types and tracking hosts are blocked inside Chrome with the CDP Network.setBlockedURLs
+    command. Only with BLOCK_HOST_ACTION=stub are tracking requests routed, so that they can be
+    answered with an empty response; no other request is routed."""
+    
+    def __init__(self, page):
+        self.page = page
+        self.resource_types = {value.strip() for value in os.getenv(
+            'BLOCK_RESOURCE_TYPES', 'image,font,media'
+        ).split(',') if value.strip()}
+        self.host_patterns = [value.strip() for value in os.getenv(
+            'BLOCK_HOST_PATTERNS',
+            'google-analytics.com,googletagmanager.com,doubleclick.net,facebook.net,hotjar.com,clarity.ms,segment.io,nr-data.net'
+        ).split(',') if value.strip()]
+        self.stub_hosts = os.getenv('BLOCK_HOST_ACTION', 'abort').lower() == 'stub'
+        self.host_route = re.compile(
+            r'^[a-z]+://([^/]*\.)?(' + '|'.join(re.escape(host) for host in self.host_patterns) + r')(:\d+)?/'
+        ) if self.host_patterns else None
+        self.session = None
+        self.blocked = {}
+        self.estimated_bytes = 0
+    
+    def blocked_url_patterns(self):
+        patterns = []
+        for resource_type in sorted(self.resource_types):
+            extensions = RESOURCE_TYPE_EXTENSIONS.get(resource_type)
+            if extensions is None:
+                print(f"Warning: Can't block resource type '{resource_type}', "
+                      f"supported types are {', '.join(RESOURCE_TYPE_EXTENSIONS)}")
+                continue
+            for extension in extensions:
+                patterns += [f"*.{extension}", f"*.{extension}?*"]
+        if not self.stub_hosts:
+            patterns += [f"*{host}/*" for host in self.host_patterns]
+        return patterns
+    
+    def install(self):
+        self.session = self.page.context.new_cdp_session(self.page)
+        self.session.send("Network.enable")
+        self.session.send("Network.setBlockedURLs", {"urls": self.blocked_url_patterns()})
+        self.page.on("requestfailed", self._on_request_failed)
+        if self.stub_hosts and self.host_route:
+            self.page.route(self.host_route, self._stub)
+        print(f"Blocking {', '.join(sorted(self.resource_types)) or 'no resource types'} and "
+              f"{'stubbing' if self.stub_hosts else 'blocking'} {len(self.host_patterns)} host pattern(s)")
+    
+    def remove(self):
+        self.page.remove_listener("requestfailed", self._on_request_failed)
+        if self.stub_hosts and self.host_route:
+            self.page.unroute(self.host_route, self._stub)
+        self.session.send("Network.setBlockedURLs", {"urls": []})
+        self.session.detach()
+    
+    def _on_request_failed(self, request):
+        if 'ERR_BLOCKED_BY_CLIENT' in (request.failure or ''):
+            self._count(request)
+    
+    def _stub(self, route):
+        # Stubbed requests get an empty 200 response, so scripts waiting on them carry on
+        request = route.request
+        self._count(request)
+        route.fulfill(status=200, body='', content_type='text/javascript' if request.resource_type == 'script' else 'text/plain')
+    
+    def _count(self, request):
+        self.blocked[request.resource_type] = self.blocked.get(request.resource_type, 0) + 1
+        self.estimated_bytes += ESTIMATED_RESOURCE_BYTES.get(request.resource_type, 5000)
+    
+    def report(self):
+        total = sum(self.blocked.values())
+        details = ", ".join(f"{count} {resource_type}" for resource_type, count in sorted(self.blocked.items()))
+        print(f"Blocked {total} requests ({details or 'none'}), saving about {self.estimated_bytes / 1024:.0f} KB")
+
+_resource_blockers = {}
+
+def get_resource_blocker(page):
+    """Start blocking non-essential resources on a page if BLOCK_RESOURCES is on. Safe to call more than once."""
+    if os.getenv('BLOCK_RESOURCES', '0') != '1':
+        return None
+    blocker = _resource_blockers.get(id(page))
+    if blocker is None or blocker.page is not page:
+        blocker = ResourceBlocker(page)
+        blocker.install()
+        _resource_blockers[id(page)] = blocker
+    return blocker
+
+def release_resource_blocker(page):
+    """Stop blocking resources on a page and report what was saved"""
+    blocker = _resource_blockers.pop(id(page), None)
+    if blocker is not None and blocker.page is page:
+        try:
+            blocker.remove()
+        except Exception as e:
+            print(f"Warning: Could not restore normal requests: {e}")
+        blocker.report()
+
+def get_max_search_attempts():
+    """Read MAX_SEARCH_ATTEMPTS from the environment, falling back to 1 if it is invalid"""
+    try:
+        max_attempts = int(os.getenv('MAX_SEARCH_ATTEMPTS', '1'))
+        print(f"Maximum search attempts set to: {max_attempts}")
+    except ValueError:
+        print("Warning: Invalid MAX_SEARCH_ATTEMPTS value in .env file. Using default value of 1.")
+        max_attempts = 1
+    return max_attempts
+
+# Why the last search stopped early (None if it wasn't interrupted), so the caller can recover
+_last_search_error = None
+
 def find_number_with_three_distinct_digits(browser=None, page=None, max_attempts=None):
     """Find a number with exactly three distinct digits. If browser and page are provided, use them instead of creating new ones."""
+    global _last_search_error
+    _last_search_error = None
+    metrics = get_metrics()
     try:
         if not browser:
             print("Connecting to Chrome...")
@@ -146,10 +843,12 @@ def find_number_with_three_distinct_digits(browser=None, page=None, max_attempts
             for attempt in range(max_connect_attempts):
                 try:
                     with sync_playwright() as p:
-                        browser = p.chromium.connect_over_cdp(f"http://localhost:{os.getenv('CHROME_DEBUG_PORT', 9222)}")
+                        with metrics.time('connect'):
+                            browser = p.chromium.connect_over_cdp(f"http://localhost:{os.getenv('CHROME_DEBUG_PORT', 9222)}")
                         print("Connected to Chrome successfully!")
                         break
                 except Exception as e:
+                    record_error(e)
                     if attempt < max_connect_attempts - 1:
                         print(f"Connection attempt {attempt + 1} failed: {e}")
                         print("Retrying in 2 seconds...")
@@ -185,114 +884,772 @@ def find_number_with_three_distinct_digits(browser=None, page=None, max_attempts
                 
             page = found_page
             print(f"Found the correct page: {page.url}")
+            save_storage_state(page.context)
+            get_resource_blocker(page)
             
             # Wait for page to be fully loaded with better error handling
             print("Waiting for page to be fully loaded...")
             try:
-                page.wait_for_load_state("networkidle", timeout=int(os.getenv('PAGE_TIMEOUT', 60000)))
+                with metrics.time('load_state'):
+                    page.wait_for_load_state("networkidle", timeout=int(os.getenv('PAGE_TIMEOUT', 60000)))
             except Exception as e:
+                record_error(e)
                 print(f"Warning: Page load timeout: {e}")
                 print("Continuing anyway...")
         
         attempts = 0
         # Use provided max_attempts or read from .env with proper error handling
         if max_attempts is None:
-            try:
-                max_attempts = int(os.getenv('MAX_SEARCH_ATTEMPTS', '1'))
-                print(f"Maximum search attempts set to: {max_attempts}")
-            except ValueError:
-                print("Warning: Invalid MAX_SEARCH_ATTEMPTS value in .env file. Using default value of 1.")
-                max_attempts = 1
+            max_attempts = get_max_search_attempts()
         
-        required_digits = int(os.getenv('REQUIRED_DISTINCT_DIGITS', 3))
+        number_rules = get_number_rules()
+        # Block non-essential resources for the rest of the search (no-op if already blocking)
+        get_resource_blocker(page)
+        
+        # In network capture mode numbers are read from the page's responses first
+        capture = None
+        load_wait_mode = None
+        if os.getenv('CAPTURE_MODE', 'dom').lower() == 'network':
+            capture = get_response_capture(page)
+            load_wait_mode = 'network'
         
         while attempts < max_attempts:
             attempts += 1
             print(f"\nAttempt {attempts}/{max_attempts}: Checking current numbers...")
             
+            captured = capture.drain() if capture else []
+            if captured:
+                print(f"Captured {len(captured)} numbers from network responses")
+                new_numbers = skip_seen_numbers(captured)
+                for number, score in zip(new_numbers, score_numbers(new_numbers)):
+                    print(f"\nChecking number: {number}")
+                    if score >= number_rules.min_score:
+                        metrics.inc('matches')
+                        print(f"\nFound number with {number_rules.describe()} in the network response: {number}")
+                        print("Success! Found a suitable number.")
+                        return number, (browser, page)
+                
+                # Let the page catch up with the payload before cross-checking it
+                try:
+                    page.wait_for_function(
+                        NUMBER_SHOWN_JS,
+                        arg=str(captured[-1]),
+                        polling='mutation',
+                        timeout=int(os.getenv('LOAD_TIMEOUT', 10000))
+                    )
+                except Exception as e:
+                    record_error(e)
+                    print(f"Warning: Captured numbers did not appear on the page: {e}")
+            
             # Wait for the buttons to be visible with increased timeout
             print("Waiting for number buttons to appear...")
             try:
                 # First check if the container exists
-                container = page.wait_for_selector('div[orientation="horizontal"]', timeout=int(os.getenv('PAGE_TIMEOUT', 60000)))
+                with metrics.time('wait_for_selector'):
+                    container = page.wait_for_selector('div[orientation="horizontal"]', timeout=int(os.getenv('PAGE_TIMEOUT', 60000)))
                 if not container:
                     print("Could not find the button container!")
                     continue
                     
                 # Then wait for buttons
-                buttons = page.wait_for_selector('div[orientation="horizontal"] button', timeout=int(os.getenv('PAGE_TIMEOUT', 60000)))
+                with metrics.time('wait_for_selector'):
+                    buttons = page.wait_for_selector('div[orientation="horizontal"] button', timeout=int(os.getenv('PAGE_TIMEOUT', 60000)))
                 if not buttons:
                     print("Could not find any number buttons!")
                     continue
                     
                 print("Found the button container and buttons!")
             except Exception as e:
+                record_error(e)
                 print(f"Error waiting for buttons: {e}")
+                if not is_page_usable(browser, page):
+                    _last_search_error = e
+                    return None, (browser, page)
                 print("Current page content:")
                 print(page.content())
                 continue
             
-            # Get all buttons containing numbers
-            buttons = page.query_selector_all('div[orientation="horizontal"] button')
-            print(f"Found {len(buttons)} number buttons")
+            # Get all numbers from the buttons
+            numbers, round_trips, elapsed = extract_numbers(page)
+            print(f"Found {len(numbers)} numbers in {round_trips} round trip(s) ({elapsed:.3f}s)")
+            metrics.inc('batches')
+            metrics.inc('numbers_examined', len(numbers))
+            metrics.maybe_export()
+            get_checkpoint().add_batch()
             
-            # Check each button for numbers with exactly the required number of distinct digits
-            for button in buttons:
-                try:
-                    # Get the number from the markdown div inside the button
-                    markdown_div = button.query_selector('div.markdown')
-                    if markdown_div:
-                        number_text = markdown_div.inner_text()
-                        number = int(number_text)
-                        print(f"\nChecking number: {number}")
-                        
-                        # Check if the number has exactly the required number of distinct digits
-                        if has_exactly_three_distinct_digits(number):
-                            print(f"\nFound number with exactly {required_digits} distinct digits: {number}")
-                            print("Success! Found a suitable number.")
-                            return number, (browser, page)
-                except Exception as e:
-                    print(f"Error processing button: {e}")
-                    continue
+            if captured:
+                missing = set(captured) - set(numbers)
+                if missing:
+                    print(f"Cross-check: {len(missing)} captured numbers are not on the page: {sorted(missing)}")
+                else:
+                    print("Cross-check: captured numbers match the page")
+                # The captured numbers were checked above, only check what the payload missed
+                captured_set = set(captured)
+                numbers = [number for number in numbers if number not in captured_set]
             
-            # If no number with required distinct digits found, click "Show more numbers"
+            # Score the new numbers at once and check each one against the rules
+            new_numbers = skip_seen_numbers(numbers)
+            for number, score in zip(new_numbers, score_numbers(new_numbers)):
+                print(f"\nChecking number: {number}")
+                if score >= number_rules.min_score:
+                    metrics.inc('matches')
+                    print(f"\nFound number with {number_rules.describe()}: {number}")
+                    print("Success! Found a suitable number.")
+                    return number, (browser, page)
+            
+            # If no suitable number found, click "Show more numbers"
             try:
                 print("\nLooking for 'Show more numbers' button...")
-                show_more_button = page.query_selector('span:has-text("Show more numbers")')
-                if show_more_button:
-                    print("No suitable number found. Clicking 'Show more numbers'...")
-                    show_more_button.click()
-                    print("Clicked 'Show more numbers'")
-                    # Wait for new numbers to load
-                    print("Waiting for new numbers to load...")
-                    time.sleep(int(os.getenv('LOAD_WAIT_TIME', 3)))  # Increased wait time
-                    # Wait for the old numbers to disappear and new ones to appear
-                    page.wait_for_selector('div[orientation="horizontal"] button', timeout=int(os.getenv('PAGE_TIMEOUT', 60000)))
-                else:
+                if not click_show_more(page, load_wait_mode, capture):
                     print("No more numbers available")
                     return None, (browser, page)
             except Exception as e:
+                record_error(e)
                 print(f"Error clicking show more button: {e}")
+                _last_search_error = e
                 return None, (browser, page)
         
         print(f"\nReached maximum attempts ({max_attempts}) without finding a suitable number")
         return None, (browser, page)
     except Exception as e:
+        record_error(e)
         print(f"Error in find_number_with_three_distinct_digits: {e}")
+        _last_search_error = e
         return None, (browser, page)
 
+def get_browser_session_state():
+    """Read the cookies and user agent from the debug Chrome instance.
+    Returns empty state if Chrome is not running with remote debugging."""
+    port = os.getenv('CHROME_DEBUG_PORT', 9222)
+    try:
+        requests.get(f"http://localhost:{port}/json/version", timeout=2)
+    except Exception:
+        print("Chrome debugger is not running, continuing without browser cookies")
+        return [], None
+    
+    cookies = []
+    user_agent = None
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.connect_over_cdp(f"http://localhost:{port}")
+            for context in browser.contexts:
+                cookies.extend(context.cookies())
+                if context.pages and not user_agent:
+                    user_agent = context.pages[0].evaluate("navigator.userAgent")
+        print(f"Copied {len(cookies)} cookies from Chrome")
+    except Exception as e:
+        print(f"Warning: Could not read cookies from Chrome: {e}")
+    return cookies, user_agent
+
+def create_http_session(cookies=None, user_agent=None):
+    """Create a persistent HTTP session with pooled connections and the given browser cookies"""
+    session = requests.Session()
+    pool_size = int(os.getenv('HTTP_POOL_SIZE', 10))
+    retries = Retry(
+        total=int(os.getenv('HTTP_RETRIES', 3)),
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504)
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    
+    for cookie in cookies or []:
+        session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+    session.headers['Accept'] = 'application/json'
+    if user_agent:
+        session.headers['User-Agent'] = user_agent
+    return session
+
+def find_number_over_http(session, max_attempts=None, start_page=None):
+    """Find a number with exactly three distinct digits by paging through the number listing over HTTP.
+    Returns the number and (session, next page) so the search can be continued from where it stopped."""
+    api_url = os.getenv('NUMBERS_API_URL', '')
+    page_number = start_page if start_page is not None else int(os.getenv('NUMBERS_API_START_PAGE', 1))
+    if not api_url:
+        print("NUMBERS_API_URL is not set. Please set it to the number listing endpoint.")
+        return None, (session, page_number)
+    
+    if max_attempts is None:
+        max_attempts = get_max_search_attempts()
+    page_param = os.getenv('NUMBERS_API_PAGE_PARAM', 'page')
+    timeout = int(os.getenv('PAGE_TIMEOUT', 60000)) / 1000
+    number_rules = get_number_rules()
+    
+    for attempts in range(1, max_attempts + 1):
+        print(f"\nAttempt {attempts}/{max_attempts}: Fetching page {page_number}...")
+        start = time.perf_counter()
+        try:
+            response = session.get(api_url, params={page_param: page_number}, timeout=timeout)
+            response.raise_for_status()
+            numbers = parse_numbers_from_payload(response.json())
+        except Exception as e:
+            print(f"Error fetching numbers: {e}")
+            return None, (session, page_number)
+        print(f"Found {len(numbers)} numbers in {time.perf_counter() - start:.3f}s")
+        page_number += 1
+        
+        if not numbers:
+            print("No more numbers available")
+            return None, (session, page_number)
+        
+        new_numbers = skip_seen_numbers(numbers)
+        for number, score in zip(new_numbers, score_numbers(new_numbers)):
+            print(f"\nChecking number: {number}")
+            if score >= number_rules.min_score:
+                print(f"\nFound number with {number_rules.describe()}: {number}")
+                print("Success! Found a suitable number.")
+                return number, (session, page_number)
+    
+    print(f"\nReached maximum attempts ({max_attempts}) without finding a suitable number")
+    return None, (session, page_number)
+
+def run_http_search():
+    """Search for numbers over HTTP instead of through the browser"""
+    cookies, user_agent = [], None
+    if os.getenv('USE_BROWSER_COOKIES', '1') == '1':
+        cookies, user_agent = get_browser_session_state()
+    session = create_http_session(cookies, user_agent)
+    found_numbers = []
+    next_page = None
+    
+    print(f"\nSearching for numbers with {get_number_rules().describe()} over HTTP...")
+    try:
+        while True:
+            result, (session, next_page) = find_number_over_http(session, start_page=next_page)
+            if not result:
+                print("\nNo suitable number found.")
+                break
+            found_numbers.append(result)
+            print(f"\nFound numbers so far: {found_numbers}")
+            
+            print("\nDo you want to continue searching? (y/n)")
+            if input().lower() != 'y':
+                break
+    finally:
+        session.close()
+    
+    if found_numbers:
+        print(f"\nAll found numbers: {found_numbers}")
+    else:
+        print(f"No numbers with {get_number_rules().describe()} found")
+
+def find_target_page(browser):
+    """Find the open tab on the Eight number selection page, or None if there isn't one"""
+    target_url = os.getenv('TARGET_URL', 'https://account.eight.com.sg/activation/choose-number')
+    for context in browser.contexts:
+        for page in context.pages:
+            if target_url in page.url:
+                print(f"Found the correct page: {page.url}")
+                save_storage_state(context)
+                return page
+    print(f"Could not find page with URL containing '{target_url}'")
+    print("Please make sure you're on the Eight number selection page")
+    return None
+
+def is_page_usable(browser, page):
+    """Check that the CDP connection is up and the page is still on the number selection page"""
+    target_url = os.getenv('TARGET_URL', 'https://account.eight.com.sg/activation/choose-number')
+    try:
+        return (browser is not None and browser.is_connected() and page is not None
+                and not page.is_closed() and target_url in page.url)
+    except Exception:
+        return False
+
+def recover_search_page(playwright, browser, page, reason):
+    """Get the search going again after an interruption: reconnect if the CDP connection dropped,
+    find the number selection page by URL (navigating back to it if no tab is on it) and wait for
+    the numbers. Numbers already examined are skipped by the seen-number index, so nothing is
+    checked twice. Returns (browser, page), with page None if every attempt failed."""
+    print(f"\nSearch interrupted ({reason}), recovering...")
+    target_url = os.getenv('TARGET_URL', 'https://account.eight.com.sg/activation/choose-number')
+    timeout = int(os.getenv('PAGE_TIMEOUT', 60000))
+    attempts = int(os.getenv('RECOVERY_ATTEMPTS', 3))
+    start = time.perf_counter()
+    # The interrupted page keeps its resource blocker until recovery has settled on a page
+    interrupted_page = page
+    for attempt in range(1, attempts + 1):
+        try:
+            if browser is None or not browser.is_connected():
+                if not wait_for_chrome_debugger():
+                    raise RuntimeError("Chrome debugger is not reachable")
+                browser = playwright.chromium.connect_over_cdp(f"http://localhost:{os.getenv('CHROME_DEBUG_PORT', 9222)}")
+                print("Reconnected to Chrome")
+                # Pages from the old connection can't be used any more
+                page = None
+            
+            if is_page_usable(browser, page):
+                print("Reloading the number selection page...")
+                page.reload(wait_until='domcontentloaded', timeout=timeout)
+            else:
+                found_page = find_target_page(browser)
+                if found_page is None:
+                    if page is None or page.is_closed():
+                        context = browser.contexts[0] if browser.contexts else browser.new_context()
+                        page = context.pages[0] if context.pages else context.new_page()
+                    print(f"Navigating back to {target_url}...")
+                    page.goto(target_url, wait_until='domcontentloaded', timeout=timeout)
+                else:
+                    page = found_page
+            
+            page.wait_for_selector('div[orientation="horizontal"] button', timeout=timeout)
+            if page is not interrupted_page:
+                release_resource_blocker(interrupted_page)
+            get_resource_blocker(page)
+            elapsed = time.perf_counter() - start
+            get_metrics().observe('recovery', elapsed)
+            get_checkpoint().add_recovery(reason, elapsed, True)
+            print(f"Recovered in {elapsed:.2f}s after {attempt} attempt(s), resuming the search")
+            return browser, page
+        except Exception as e:
+            record_error(e)
+            print(f"Recovery attempt {attempt}/{attempts} failed: {e}")
+            if attempt < attempts:
+                time.sleep(min(2 ** attempt, 30))
+    
+    release_resource_blocker(interrupted_page)
+    elapsed = time.perf_counter() - start
+    get_checkpoint().add_recovery(reason, elapsed, False)
+    print(f"Could not recover the search after {elapsed:.2f}s")
+    return browser, None
+
+def iter_number_batches(page, max_batches=None, load_wait_mode=None):
+    """Yield the numbers on the page one batch at a time, clicking "Show more numbers" between batches.
+    Stops after max_batches batches (never if None) or when there are no more numbers."""
+    batches = range(1, max_batches + 1) if max_batches is not None else itertools.count(1)
+    metrics = get_metrics()
+    for batch in batches:
+        with metrics.time('wait_for_selector'):
+            page.wait_for_selector('div[orientation="horizontal"] button', timeout=int(os.getenv('PAGE_TIMEOUT', 60000)))
+        numbers, round_trips, elapsed = extract_numbers(page)
+        metrics.inc('batches')
+        metrics.inc('numbers_examined', len(numbers))
+        metrics.maybe_export()
+        print(f"\nBatch {batch}/{max_batches or 'unlimited'}: Found {len(numbers)} numbers in {round_trips} round trip(s) ({elapsed:.3f}s)")
+        yield numbers
+        
+        if batch == max_batches:
+            break
+        if not click_show_more(page, load_wait_mode):
+            print("No more numbers available")
+            break
+
+class TopNumbers:
+    """Keeps the K highest-scoring numbers seen so far in a bounded min-heap"""
+    
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+        self.members = set()
+    
+    def offer(self, number, score):
+        """Add a number if it beats the lowest kept score. Returns True if the top K changed."""
+        if number in self.members:
+            return False
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, (score, number))
+        elif score > self.heap[0][0]:
+            _, removed = heapq.heapreplace(self.heap, (score, number))
+            self.members.discard(removed)
+        else:
+            return False
+        self.members.add(number)
+        return True
+    
+    def lowest_score(self):
+        """The score a number has to beat to get in, or None while fewer than k numbers are kept"""
+        return self.heap[0][0] if len(self.heap) == self.k else None
+    
+    def ranked(self):
+        """Return (score, number) pairs, best first"""
+        return sorted(self.heap, reverse=True)
+
+def find_top_numbers(page, k=None, max_batches=None, time_budget=None):
+    """Scan up to max_batches batches (or time_budget seconds) and keep the k highest-scoring numbers.
+    Improvements are printed as they happen. Returns (score, number) pairs, best first."""
+    k = k or int(os.getenv('TOP_K', 10))
+    max_batches = max_batches or int(os.getenv('TOP_K_BATCH_BUDGET', os.getenv('MAX_SEARCH_ATTEMPTS', '1')))
+    if time_budget is None:
+        time_budget = float(os.getenv('TOP_K_TIME_BUDGET', 0))
+    number_rules = get_number_rules()
+    top = TopNumbers(k)
+    examined = 0
+    start = time.perf_counter()
+    
+    print(f"\nKeeping the top {k} numbers by score for {number_rules.describe()} over up to {max_batches} batches...")
+    try:
+        for numbers in iter_number_batches(page, max_batches):
+            examined += len(numbers)
+            # Numbers scored before under the same rules are ranked by their stored score, so
+            # near-misses from earlier runs still count
+            known_scores = get_known_scores(numbers)
+            new_numbers = [number for number in numbers if number not in known_scores]
+            scored = list(zip(new_numbers, score_numbers(new_numbers))) + list(known_scores.items())
+            for number, score in scored:
+                # Numbers that meet none of the rules are never worth keeping
+                if score > 0 and top.offer(number, float(score)):
+                    cutoff = top.lowest_score()
+                    if cutoff is None:
+                        print(f"New top {k} number: {number} (score {score:g}, {len(top.heap)} of {k} kept)")
+                    else:
+                        print(f"New top {k} number: {number} (score {score:g}, lowest kept score {cutoff:g})")
+            
+            if time_budget and time.perf_counter() - start >= time_budget:
+                print(f"Time budget of {time_budget:g}s reached")
+                break
+    except Exception as e:
+        print(f"Error during top {k} search: {e}")
+    
+    ranked = top.ranked()
+    print(f"\nExamined {examined} numbers in {time.perf_counter() - start:.1f}s")
+    if ranked:
+        print(f"Top {len(ranked)} numbers:")
+        for rank, (score, number) in enumerate(ranked, 1):
+            print(f"{rank:>3}. {number} (score {score:g})")
+    return ranked
+
+def run_top_k_search():
+    """Connect to Chrome and run an unattended top K search on the number selection page"""
+    with sync_playwright() as p:
+        print("Connecting to Chrome...")
+        browser = p.chromium.connect_over_cdp(f"http://localhost:{os.getenv('CHROME_DEBUG_PORT', 9222)}")
+        page = find_target_page(browser)
+        if not page:
+            return []
+        get_resource_blocker(page)
+        ranked = find_top_numbers(page)
+        release_resource_blocker(page)
+        return ranked
+
+class JsonlWriter:
+    """Writes one JSON object per line to stdout or a file, flushing after every line"""
+    
+    def __init__(self, path):
+        self.file = sys.stdout if path == '-' else open(path, 'a')
+    
+    def emit(self, event, **fields):
+        record = {"event": event, "time": datetime.now(timezone.utc).isoformat(), **fields}
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+    
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+def run_daemon(writer, max_batches=None, stop_after_matches=None, idle_wait=None):
+    """Search without any prompts until stopped, writing every batch and match to writer.
+    When the numbers run out the page is reloaded after idle_wait seconds. SIGTERM and Ctrl+C
+    stop the search after the current batch and write a final summary."""
+    idle_wait = idle_wait if idle_wait is not None else float(os.getenv('DAEMON_IDLE_WAIT', 30))
+    number_rules = get_number_rules()
+    stop_event = threading.Event()
+    stop_reason = "max_batches"
+    
+    def request_stop(signum, frame):
+        print(f"Received signal {signum}, stopping after the current batch...")
+        stop_event.set()
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    
+    batches = 0
+    examined = 0
+    errors = 0
+    matches = []
+    seen_matches = set()
+    start = time.perf_counter()
+    writer.emit("start", rules=number_rules.describe(), max_batches=max_batches)
+    
+    def recover(playwright, browser, page, reason):
+        """Reconnect or reload after an interruption, ending the run only if that fails"""
+        recovery_start = time.perf_counter()
+        browser, page = recover_search_page(playwright, browser, page, reason)
+        if page is None:
+            raise RuntimeError("Could not recover the number selection page")
+        writer.emit("recovered", batch=batches, seconds=round(time.perf_counter() - recovery_start, 3))
+        return browser, page
+    
+    try:
+        if not wait_for_chrome_debugger():
+            raise RuntimeError("Chrome debugger is not reachable")
+        with sync_playwright() as p:
+            browser = p.chromium.connect_over_cdp(f"http://localhost:{os.getenv('CHROME_DEBUG_PORT', 9222)}")
+            page = find_target_page(browser)
+            if not page:
+                raise RuntimeError("Could not find the number selection page")
+            get_resource_blocker(page)
+            
+            while not stop_event.is_set():
+                remaining = max_batches - batches if max_batches else None
+                if remaining == 0:
+                    break
+                batches_this_pass = 0
+                try:
+                    for numbers in iter_number_batches(page, remaining):
+                        batch_start = time.perf_counter()
+                        batches += 1
+                        batches_this_pass += 1
+                        examined += len(numbers)
+                        new_numbers = skip_seen_numbers(numbers)
+                        scores = score_numbers(new_numbers)
+                        # Earlier matches pass the seen-number index again, so only report each one once
+                        batch_matches = [
+                            (number, float(score)) for number, score in zip(new_numbers, scores)
+                            if score >= number_rules.min_score and number not in seen_matches
+                        ]
+                        writer.emit(
+                            "batch", batch=batches, count=len(numbers), new=len(new_numbers),
+                            matches=len(batch_matches), seconds=round(time.perf_counter() - batch_start, 4),
+                            pacing_rate=get_pacing().rate, numbers=numbers
+                        )
+                        get_metrics().inc('matches', len(batch_matches))
+                        for number, score in batch_matches:
+                            matches.append(number)
+                            seen_matches.add(number)
+                            writer.emit("match", batch=batches, number=number, score=score)
+                        
+                        if stop_after_matches and len(matches) >= stop_after_matches:
+                            stop_reason = "matches"
+                            stop_event.set()
+                        if stop_event.is_set():
+                            break
+                except Exception as e:
+                    errors += 1
+                    record_error(e)
+                    writer.emit("error", batch=batches, message=str(e))
+                    if not is_page_usable(browser, page):
+                        browser, page = recover(p, browser, page, str(e))
+                        continue
+                else:
+                    if stop_event.is_set() or remaining is not None and batches_this_pass >= remaining:
+                        continue
+                    writer.emit("exhausted", batch=batches)
+                
+                # Out of numbers or hit an error: wait, then reload for a fresh set of numbers
+                if stop_event.wait(idle_wait):
+                    break
+                try:
+                    page.reload(wait_until='domcontentloaded')
+                except Exception as e:
+                    errors += 1
+                    record_error(e)
+                    writer.emit("error", batch=batches, message=f"Reload failed: {e}")
+                    browser, page = recover(p, browser, page, str(e))
+            release_resource_blocker(page)
+    except Exception as e:
+        errors += 1
+        stop_reason = "error"
+        writer.emit("error", batch=batches, message=str(e))
+    
+    if stop_reason == "max_batches" and stop_event.is_set():
+        stop_reason = "signal"
+    seen_index = get_seen_index()
+    writer.emit(
+        "summary", reason=stop_reason, batches=batches, numbers_examined=examined,
+        matches=matches, errors=errors, seconds=round(time.perf_counter() - start, 3),
+        numbers_seen_total=seen_index.count() if seen_index is not None else None,
+        pacing_rate=get_pacing().rate
+    )
+    return 1 if stop_reason == "error" else 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Search the Eight number selection page for suitable numbers")
+    parser.add_argument("--daemon", action="store_true", help="Run without prompts until stopped, writing JSON lines")
+    parser.add_argument("--launch", action="store_true", help="Start Chrome with remote debugging (or reuse a running instance) instead of asking you to")
+    parser.add_argument("--output", default="-", help="File to append JSON lines to in daemon mode (default: stdout)")
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches (default: never)")
+    parser.add_argument("--stop-after-matches", type=int, default=None, help="Stop after this many matches (default: never)")
+    parser.add_argument("--idle-wait", type=float, default=None, help="Seconds to wait before reloading when the numbers run out")
+    parser.add_argument("--rules", default=None, help="Number rules, overrides NUMBER_RULES")
+    parser.add_argument("--min-score", type=float, default=None, help="Score needed to match, overrides MIN_RULE_SCORE")
+    return parser.parse_args(argv)
+
+class MatchCollector:
+    """De-duplicating collector shared by the parallel search workers"""
+    
+    def __init__(self, wanted):
+        self.wanted = wanted
+        self.seen = set()
+        self.matches = []
+        self.examined = 0
+        self.done = asyncio.Event()
+    
+    def add_batch(self, tab_index, numbers):
+        """Check the numbers not seen by any tab yet. Returns how many were new."""
+        new_numbers = [number for number in numbers if number not in self.seen]
+        self.seen.update(new_numbers)
+        self.examined += len(new_numbers)
+        new_numbers = skip_seen_numbers(new_numbers)
+        number_rules = get_number_rules()
+        for number, score in zip(new_numbers, score_numbers(new_numbers)):
+            if self.done.is_set():
+                break
+            if score >= number_rules.min_score:
+                self.matches.append(number)
+                get_metrics().inc('matches')
+                print(f"\n[Tab {tab_index}] Found number with {number_rules.describe()}: {number}")
+                if len(self.matches) >= self.wanted:
+                    self.done.set()
+        return len(new_numbers)
+
+async def click_show_more_async(page):
+    """Async version of click_show_more, waiting for the DOM change only"""
+    show_more_button = await page.query_selector('span:has-text("Show more numbers")')
+    if not show_more_button:
+        return False
+    incremental = is_incremental_extraction()
+    if incremental:
+        await page.evaluate(HOLD_NEW_NUMBERS_JS)
+    previous_signature = None if incremental else await page.evaluate(NUMBERS_SIGNATURE_JS)
+    await show_more_button.click()
+    try:
+        if incremental:
+            await page.wait_for_function(
+                NEW_NUMBERS_PENDING_JS,
+                polling='mutation',
+                timeout=int(os.getenv('LOAD_TIMEOUT', 10000))
+            )
+        else:
+            await page.wait_for_function(
+                NUMBERS_CHANGED_JS,
+                arg=previous_signature,
+                polling='mutation',
+                timeout=int(os.getenv('LOAD_TIMEOUT', 10000))
+            )
+    except Exception as e:
+        if isinstance(e, asyncio.CancelledError):
+            raise
+        print(f"Warning: Could not detect new numbers ({e}), falling back to fixed wait...")
+        await asyncio.sleep(int(os.getenv('LOAD_WAIT_TIME', 3)))
+    return True
+
+async def search_tab(tab_index, page, collector, max_batches):
+    """Pull batches on one tab until enough matches are found, the numbers run out or it is cancelled"""
+    batches = 0
+    try:
+        while batches < max_batches and not collector.done.is_set():
+            await page.wait_for_selector('div[orientation="horizontal"] button', timeout=int(os.getenv('PAGE_TIMEOUT', 60000)))
+            if is_incremental_extraction():
+                texts = await page.evaluate(DRAIN_NEW_NUMBERS_JS)
+            else:
+                texts = await page.eval_on_selector_all('div[orientation="horizontal"] button', EXTRACT_NUMBERS_JS)
+            numbers = parse_number_texts(texts)
+            batches += 1
+            metrics = get_metrics()
+            metrics.inc('batches')
+            metrics.inc('numbers_examined', len(numbers))
+            new_count = collector.add_batch(tab_index, numbers)
+            metrics.maybe_export()
+            print(f"[Tab {tab_index}] Batch {batches}: {len(numbers)} numbers, {new_count} new")
+            
+            if collector.done.is_set():
+                break
+            if not await click_show_more_async(page):
+                print(f"[Tab {tab_index}] No more numbers available")
+                break
+    except asyncio.CancelledError:
+        print(f"[Tab {tab_index}] Stopped after {batches} batches")
+        raise
+    except Exception as e:
+        print(f"[Tab {tab_index}] Error: {e}")
+    return batches
+
+async def find_numbers_parallel(wanted=1, tabs=None, max_batches=None):
+    """Search on several tabs of the target page at once until `wanted` matching numbers are found.
+    Returns the list of matching numbers."""
+    tabs = tabs or int(os.getenv('PARALLEL_TABS', 4))
+    max_batches = max_batches or int(os.getenv('MAX_SEARCH_ATTEMPTS', '1'))
+    target_url = os.getenv('TARGET_URL', 'https://account.eight.com.sg/activation/choose-number')
+    
+    async with async_playwright() as p:
+        print("Connecting to Chrome...")
+        browser = await p.chromium.connect_over_cdp(f"http://localhost:{os.getenv('CHROME_DEBUG_PORT', 9222)}")
+        found_page = None
+        for context in browser.contexts:
+            for candidate in context.pages:
+                if target_url in candidate.url:
+                    found_page = candidate
+                    break
+            if found_page:
+                break
+        if not found_page:
+            print(f"Could not find page with URL containing '{target_url}'")
+            print("Please make sure you're on the Eight number selection page")
+            return []
+        
+        # Extra tabs share the context of the verified page, so they reuse its cookies
+        print(f"Opening {tabs - 1} more tab(s) on {found_page.url}...")
+        pages = [found_page]
+        for _ in range(tabs - 1):
+            new_page = await found_page.context.new_page()
+            await new_page.goto(found_page.url, wait_until='domcontentloaded')
+            pages.append(new_page)
+        
+        collector = MatchCollector(wanted)
+        start = time.perf_counter()
+        workers = [asyncio.create_task(search_tab(index + 1, page, collector, max_batches)) for index, page in enumerate(pages)]
+        done_waiter = asyncio.create_task(collector.done.wait())
+        all_finished = asyncio.gather(*workers, return_exceptions=True)
+        await asyncio.wait({done_waiter, all_finished}, return_when=asyncio.FIRST_COMPLETED)
+        
+        # Stop the remaining workers as soon as enough matches are found
+        for worker in workers:
+            worker.cancel()
+        await all_finished
+        done_waiter.cancel()
+        elapsed = time.perf_counter() - start
+        
+        for page in pages[1:]:
+            await page.close()
+    
+    rate = collector.examined / elapsed if elapsed else 0
+    print(f"\nExamined {collector.examined} unique numbers on {tabs} tab(s) in {elapsed:.1f}s ({rate:.1f} numbers/s)")
+    return collector.matches
+
 if __name__ == "__main__":
-    print("\nPlease follow these steps:")
-    print("1. Open Chrome with remote debugging enabled:")
-    print("   - Close all Chrome windows")
-    print("   - Open Command Prompt as Administrator")
-    print("   - Navigate to your Chrome installation directory")
-    print(f"   - Run: chrome.exe --remote-debugging-port={os.getenv('CHROME_DEBUG_PORT', 9222)}")
-    print(f"2. Navigate to {os.getenv('TARGET_URL', 'https://account.eight.com.sg/activation/choose-number')}")
-    print("3. Complete any human verification if needed")
-    print("4. Get to the page with the numbers")
-    print("5. Press Enter when ready to start the script")
-    input()
+    args = parse_args()
+    if args.rules is not None:
+        os.environ['NUMBER_RULES'] = args.rules
+    if args.min_score is not None:
+        os.environ['MIN_RULE_SCORE'] = str(args.min_score)
+    
+    # Compile the number rules up front so an invalid NUMBER_RULES fails before any searching
+    try:
+        get_number_rules()
+    except ValueError as e:
+        print(f"Invalid NUMBER_RULES: {e}")
+        exit(1)
+    
+    if args.daemon:
+        writer = JsonlWriter(args.output)
+        # Keep stdout for JSON lines, progress messages go to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            if args.launch and not launch_chrome_with_debugging(interactive=False):
+                exit(1)
+            exit_code = run_daemon(writer, args.max_batches, args.stop_after_matches, args.idle_wait)
+        writer.close()
+        exit(exit_code)
+    
+    if os.getenv('SEARCH_ENGINE', 'browser').lower() == 'http':
+        run_http_search()
+        report_seen_coverage()
+        report_pacing()
+        exit(0)
+    
+    if args.launch:
+        if not launch_chrome_with_debugging():
+            exit(1)
+    else:
+        print("\nPlease follow these steps:")
+        print("1. Open Chrome with remote debugging enabled:")
+        print("   - Close all Chrome windows")
+        print("   - Open Command Prompt as Administrator")
+        print("   - Navigate to your Chrome installation directory")
+        print(f"   - Run: chrome.exe --remote-debugging-port={os.getenv('CHROME_DEBUG_PORT', 9222)}")
+        print(f"2. Navigate to {os.getenv('TARGET_URL', 'https://account.eight.com.sg/activation/choose-number')}")
+        print("3. Complete any human verification if needed")
+        print("4. Get to the page with the numbers")
+        print("5. Press Enter when ready to start the script")
+        input()
 
     # Wait for Chrome debugger
     if not wait_for_chrome_debugger():
@@ -303,20 +1660,42 @@ if __name__ == "__main__":
         print("4. Run the script again")
         exit(1)
 
+    search_mode = os.getenv('SEARCH_MODE', 'interactive').lower()
+    if search_mode == 'topk':
+        ranked = run_top_k_search()
+        if not ranked:
+            print(f"No numbers with {get_number_rules().describe()} found")
+        report_seen_coverage()
+        report_pacing()
+        exit(0)
+
+    if search_mode == 'parallel':
+        wanted = int(os.getenv('PARALLEL_TARGET_MATCHES', 1))
+        matches = asyncio.run(find_numbers_parallel(wanted))
+        if matches:
+            print(f"\nAll found numbers: {matches}")
+        else:
+            print(f"No numbers with {get_number_rules().describe()} found")
+        report_seen_coverage()
+        report_pacing()
+        exit(0)
+
     # Run the main script
     browser = None
     page = None
-    found_numbers = []
+    checkpoint = start_checkpoint()
+    found_numbers = list(checkpoint.found_numbers)
+    recoveries = 0
     current_max_attempts = int(os.getenv('MAX_SEARCH_ATTEMPTS', '1'))
-    required_digits = int(os.getenv('REQUIRED_DISTINCT_DIGITS', 3))
     
-    print(f"\nSearching for numbers with exactly {required_digits} distinct digits...")
+    print(f"\nSearching for numbers with {get_number_rules().describe()}...")
     
     try:
-        with sync_playwright() as p:
+        with sync_playwright() as playwright:
             # Connect to the existing Chrome instance
             print("Connecting to Chrome...")
-            browser = p.chromium.connect_over_cdp(f"http://localhost:{os.getenv('CHROME_DEBUG_PORT', 9222)}")
+            with get_metrics().time('connect'):
+                browser = playwright.chromium.connect_over_cdp(f"http://localhost:{os.getenv('CHROME_DEBUG_PORT', 9222)}")
             
             # Get all pages and find the one with the Eight URL
             print("Looking for the Eight number selection page...")
@@ -338,12 +1717,25 @@ if __name__ == "__main__":
             else:
                 page = found_page
                 print(f"Found the correct page: {page.url}")
+                save_storage_state(page.context)
                 
                 while True:
                     # Search for numbers
-                    result, (browser, page) = find_number_with_three_distinct_digits(browser, page, current_max_attempts)
+                    with get_metrics().time('search'):
+                        result, (browser, page) = find_number_with_three_distinct_digits(browser, page, current_max_attempts)
+                    # Reconnect or reload and carry on if the search was cut short
+                    if not result and (_last_search_error is not None or not is_page_usable(browser, page)):
+                        if recoveries < int(os.getenv('MAX_RECOVERIES', 5)):
+                            recoveries += 1
+                            reason = str(_last_search_error or "page is no longer on the number selection page")
+                            browser, page = recover_search_page(playwright, browser, page, reason)
+                            if page is not None:
+                                continue
                     if result:
-                        found_numbers.append(result)
+                        # Earlier matches are checked again, so a resumed run can find the same number twice
+                        if result not in found_numbers:
+                            found_numbers.append(result)
+                        checkpoint.add_found(result)
                         print(f"\nFound numbers so far: {found_numbers}")
                         
                         # Ask if user wants to continue searching
@@ -352,7 +1744,7 @@ if __name__ == "__main__":
                             if found_numbers:
                                 print(f"\nAll found numbers: {found_numbers}")
                             else:
-                                print(f"No numbers with exactly {os.getenv('REQUIRED_DISTINCT_DIGITS', 3)} distinct digits found")
+                                print(f"No numbers with {get_number_rules().describe()} found")
                             break
                         
                         # Ask how many more numbers to search for
@@ -369,43 +1761,49 @@ if __name__ == "__main__":
                             print("Invalid input. Using default number of searches.")
                             current_max_attempts = int(os.getenv('MAX_SEARCH_ATTEMPTS', '1'))
                             
-                        # Click "Show more numbers" and continue searching
+                        # Click "Show more numbers" and continue searching; the next search
+                        # skips any numbers already in the seen-number index
                         try:
                             print("\nLooking for 'Show more numbers' button...")
-                            show_more_button = page.query_selector('span:has-text("Show more numbers")')
-                            if show_more_button:
-                                print("Clicking 'Show more numbers' to continue searching...")
-                                show_more_button.click()
-                                print("Clicked 'Show more numbers'")
-                                # Wait for new numbers to load
-                                print("Waiting for new numbers to load...")
-                                time.sleep(int(os.getenv('LOAD_WAIT_TIME', 3)))
-                                # Wait for the old numbers to disappear and new ones to appear
-                                page.wait_for_selector('div[orientation="horizontal"] button', timeout=int(os.getenv('PAGE_TIMEOUT', 60000)))
+                            if os.getenv('CAPTURE_MODE', 'dom').lower() == 'network':
+                                shown_more = click_show_more(page, 'network', get_response_capture(page))
                             else:
+                                shown_more = click_show_more(page)
+                            if not shown_more:
                                 print("No more numbers available")
                                 if found_numbers:
                                     print(f"\nAll found numbers: {found_numbers}")
                                 else:
-                                    print(f"No numbers with exactly {os.getenv('REQUIRED_DISTINCT_DIGITS', 3)} distinct digits found")
+                                    print(f"No numbers with {get_number_rules().describe()} found")
                                 break
                         except Exception as e:
+                            record_error(e)
                             print(f"Error clicking show more button: {e}")
+                            if recoveries < int(os.getenv('MAX_RECOVERIES', 5)):
+                                recoveries += 1
+                                browser, page = recover_search_page(playwright, browser, page, str(e))
+                                if page is not None:
+                                    continue
                             if found_numbers:
                                 print(f"\nAll found numbers: {found_numbers}")
                             else:
-                                print(f"No numbers with exactly {os.getenv('REQUIRED_DISTINCT_DIGITS', 3)} distinct digits found")
+                                print(f"No numbers with {get_number_rules().describe()} found")
                             break
                     else:
                         print("\nNo suitable number found in this batch.")
                         if found_numbers:
                             print(f"\nAll found numbers: {found_numbers}")
                         else:
-                            print(f"No numbers with exactly {os.getenv('REQUIRED_DISTINCT_DIGITS', 3)} distinct digits found")
+                            print(f"No numbers with {get_number_rules().describe()} found")
                         break
+                release_resource_blocker(page)
     except Exception as e:
+        record_error(e)
         print(f"An error occurred: {e}")
         if found_numbers:
             print(f"\nAll found numbers: {found_numbers}")
         else:
-            print(f"No numbers with exactly {os.getenv('REQUIRED_DISTINCT_DIGITS', 3)} distinct digits found")
+            print(f"No numbers with {get_number_rules().describe()} found")
+    
+    report_seen_coverage()
+    report_pacing()
@@ -0,0 +1,142 @@
+"""Periodic checkpoints of the search, so a run can pick up where it left off.
+
+The checkpoint is a small JSON file (CHECKPOINT_PATH, default search-checkpoint.json) holding
+the numbers found, the batches consumed, the recoveries made and the configuration of the run.
+It is written every CHECKPOINT_INTERVAL seconds, whenever a number is found or the search
+recovers, and at exit. A later interactive run with the same target and rules resumes from it.
+"""
+import atexit
+import json
+import os
+import time
+
+from metrics import write_atomically
+
+# Settings recorded with every checkpoint
+CONFIG_KEYS = (
+    'TARGET_URL', 'NUMBER_RULES', 'REQUIRED_DISTINCT_DIGITS', 'MIN_RULE_SCORE',
+    'SEARCH_MODE', 'CAPTURE_MODE', 'LOAD_WAIT_MODE', 'EXTRACTION_MODE', 'MAX_SEARCH_ATTEMPTS',
+)
+# Settings that have to match for a checkpoint to be resumed, since they decide what counts as found
+RESUME_KEYS = ('TARGET_URL', 'NUMBER_RULES', 'REQUIRED_DISTINCT_DIGITS', 'MIN_RULE_SCORE')
+
+def current_config():
+    return {key: os.getenv(key) for key in CONFIG_KEYS}
+
+class Checkpoint:
+    """Search state written to disk as JSON"""
+
+    def __init__(self, path, interval=10):
+        self.path = path
+        self.interval = interval
+        self.last_save = time.monotonic()
+        self.found_numbers = []
+        self.batches = 0
+        self.recoveries = []
+        self.started = time.time()
+        self.resumed_from = None
+
+    def load(self):
+        """Resume from the checkpoint on disk if it was made with the same target and rules.
+        Returns True if it was resumed."""
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read checkpoint {self.path}: {e}")
+            return False
+
+        config = state.get("config", {})
+        changed = [key for key in RESUME_KEYS if config.get(key) != os.getenv(key)]
+        if changed:
+            print(f"Not resuming checkpoint {self.path}: {', '.join(changed)} changed since it was saved")
+            return False
+        self.found_numbers = list(state.get("found_numbers", []))
+        self.batches = state.get("batches", 0)
+        self.recoveries = list(state.get("recoveries", []))
+        self.started = state.get("started", self.started)
+        self.resumed_from = state.get("updated")
+        print(f"Resuming from checkpoint: {len(self.found_numbers)} found number(s), {self.batches} batches consumed")
+        return True
+
+    def add_batch(self):
+        self.batches += 1
+        self.maybe_save()
+
+    def add_found(self, number):
+        if number not in self.found_numbers:
+            self.found_numbers.append(number)
+        self.save()
+
+    def add_recovery(self, reason, seconds, success):
+        self.recoveries.append({"time": time.time(), "reason": reason, "seconds": round(seconds, 3), "success": success})
+        self.save()
+
+    def snapshot(self):
+        return {
+            "config": current_config(),
+            "found_numbers": self.found_numbers,
+            "batches": self.batches,
+            "recoveries": self.recoveries,
+            "started": self.started,
+            "updated": time.time(),
+        }
+
+    def save(self):
+        self.last_save = time.monotonic()
+        try:
+            write_atomically(self.path, json.dumps(self.snapshot(), indent=2))
+        except OSError as e:
+            print(f"Warning: Could not save checkpoint: {e}")
+
+    def maybe_save(self):
+        """Save if CHECKPOINT_INTERVAL seconds have passed since the last save"""
+        if time.monotonic() - self.last_save >= self.interval:
+            self.save()
+
+class NullCheckpoint:
+    """Stand-in used when checkpoints are turned off"""
+
+    found_numbers = ()
+    batches = 0
+
+    def load(self):
+        return False
+
+    def add_batch(self):
+        pass
+
+    def add_found(self, number):
+        pass
+
+    def add_recovery(self, reason, seconds, success):
+        pass
+
+    def save(self):
+        pass
+
+    def maybe_save(self):
+        pass
+
+_checkpoint = None
+
+def get_checkpoint():
+    """Return the checkpoint started by start_checkpoint. Until then (and in every mode that doesn't
+    start one) this is a NullCheckpoint, so those modes never overwrite the saved checkpoint."""
+    return _checkpoint if _checkpoint is not None else NullCheckpoint()
+
+def start_checkpoint():
+    """Start checkpointing this run from the environment, resuming the last checkpoint unless
+    CHECKPOINT_RESUME=0. Only the interactive search calls this."""
+    global _checkpoint
+    if _checkpoint is None:
+        path = os.getenv('CHECKPOINT_PATH', 'search-checkpoint.json')
+        if not path:
+            return get_checkpoint()
+        _checkpoint = Checkpoint(path, float(os.getenv('CHECKPOINT_INTERVAL', 10)))
+        if os.getenv('CHECKPOINT_RESUME', '1') == '1':
+            _checkpoint.load()
+        atexit.register(_checkpoint.save)
+    return _checkpoint
@@ -0,0 +1,199 @@
+"""Local stand-in for the Eight number selection page and its number listing, used to try and
+benchmark the search without the real site.
+
+Run it with:
+    python fixture_server.py --port 8765 --latency 0.2 --jitter 0.05 --density 0.01
+
+then either open http://localhost:8765/activation/choose-number in the debug Chrome instance, or
+point the HTTP search engine at it:
+    SEARCH_ENGINE=http NUMBERS_API_URL=http://localhost:8765/api/numbers USE_BROWSER_COOKIES=0 python bryan.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+SESSION_COOKIE = "eight_session=fixture"
+
+# Same markup as the real choose-number page: the numbers are buttons holding a div.markdown
+# inside div[orientation="horizontal"], followed by a "Show more numbers" span
+CHOOSE_NUMBER_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>Choose your number</title></head>
+<body>
+  <h1>Choose your number</h1>
+  <div orientation="horizontal" id="numbers"></div>
+  <div id="more" role="button"><span>Show more numbers</span></div>
+  <script>
+    const APPEND = %(append)s;
+    const container = document.getElementById('numbers');
+    const more = document.getElementById('more');
+    let page = 0;
+    async function loadMore() {
+      page += 1;
+      const response = await fetch('/api/numbers?page=' + page);
+      const data = (await response.json()).data;
+      const buttons = data.availableNumbers.map(
+        item => '<button type="button"><div class="markdown">' + item.number + '</div></button>'
+      ).join('');
+      if (APPEND) container.insertAdjacentHTML('beforeend', buttons);
+      else container.innerHTML = buttons;
+      if (!data.pagination.hasMore) more.remove();
+    }
+    more.addEventListener('click', loadMore);
+    loadMore();
+  </script>
+</body>
+</html>
+"""
+
+def random_number(rng):
+    return str(rng.choice((8, 9)) * 10000000 + rng.randrange(10000000))
+
+def number_with_distinct_digits(rng, distinct_digits):
+    """Generate an 8-digit number starting with 8 or 9 that has exactly distinct_digits distinct digits"""
+    while True:
+        first = rng.choice("89")
+        digits = [first] + rng.sample([digit for digit in "0123456789" if digit != first], distinct_digits - 1)
+        number = first + "".join(rng.choice(digits) for _ in range(7))
+        if len(set(number)) == distinct_digits:
+            return number
+
+def generate_numbers(seed, page, batch_size, density=None, match_digits=3):
+    """Generate the numbers for one page. The same seed and page always give the same numbers.
+    With a density, that fraction of numbers has exactly match_digits distinct digits and the rest never do."""
+    rng = random.Random(f"{seed}:{page}")
+    if density is None:
+        return [random_number(rng) for _ in range(batch_size)]
+
+    numbers = []
+    for _ in range(batch_size):
+        if rng.random() < density:
+            numbers.append(number_with_distinct_digits(rng, match_digits))
+        else:
+            number = random_number(rng)
+            while len(set(number)) == match_digits:
+                number = random_number(rng)
+            numbers.append(number)
+    return numbers
+
+def build_payload(numbers, page, batch_size, has_more):
+    """Wrap numbers in the same payload shape as fixtures/choose_number_response.json"""
+    return {
+        "data": {
+            "availableNumbers": [
+                {"id": f"n-{page}-{index}", "number": number, "type": "standard", "price": 0}
+                for index, number in enumerate(numbers)
+            ],
+            "pagination": {"page": page, "pageSize": batch_size, "hasMore": has_more}
+        }
+    }
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves the choose-number page and /api/numbers?page=N. Settings are read from the server instance."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/activation/choose-number":
+            body = (CHOOSE_NUMBER_PAGE % {"append": "true" if self.server.append else "false"}).encode()
+            self.send_response(200)
+            self.send_header("Set-Cookie", f"{SESSION_COOKIE}; Path=/")
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif url.path == "/":
+            self.send_response(200)
+            self.send_header("Set-Cookie", f"{SESSION_COOKIE}; Path=/")
+            self.send_header("Content-Type", "text/plain")
+            self.end_headers()
+            self.wfile.write(b"Eight fixture server")
+        elif url.path == "/api/numbers":
+            self.send_numbers(parse_qs(url.query))
+        else:
+            self.send_error(404)
+
+    def send_numbers(self, query):
+        server = self.server
+        if server.require_cookie and SESSION_COOKIE not in self.headers.get("Cookie", ""):
+            self.send_error(401, "Missing session cookie")
+            return
+        try:
+            page = int(query.get("page", ["1"])[0])
+        except ValueError:
+            self.send_error(400, "Invalid page")
+            return
+
+        # Simulated server response time
+        delay = server.latency + (random.uniform(-server.jitter, server.jitter) if server.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+        numbers = []
+        if 1 <= page <= server.pages:
+            numbers = generate_numbers(server.seed, page, server.batch_size, server.density, server.match_digits)
+        body = json.dumps(build_payload(numbers, page, server.batch_size, page < server.pages)).encode()
+        server.requests_served += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def create_server(port=0, batch_size=24, pages=1000, seed=8, require_cookie=False, verbose=False,
+                  latency=0.0, jitter=0.0, density=None, match_digits=3, append=False):
+    """Create a fixture server. Use port 0 to pick a free port (see server.server_address).
+    latency and jitter are in seconds; density is the fraction of numbers with exactly
+    match_digits distinct digits (random numbers if None); append makes the page add each
+    batch below the previous ones instead of replacing them."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), FixtureHandler)
+    server.daemon_threads = True
+    server.batch_size = batch_size
+    server.pages = pages
+    server.seed = seed
+    server.require_cookie = require_cookie
+    server.verbose = verbose
+    server.latency = latency
+    server.jitter = jitter
+    server.density = density
+    server.match_digits = match_digits
+    server.append = append
+    server.requests_served = 0
+    return server
+
+def start_in_background(**kwargs):
+    """Start a fixture server on a background thread and return it"""
+    server = create_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Eight number selection page")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-size", type=int, default=24, help="Numbers per page")
+    parser.add_argument("--pages", type=int, default=1000, help="Pages before the listing runs out")
+    parser.add_argument("--seed", type=int, default=8, help="Seed for the generated numbers")
+    parser.add_argument("--require-cookie", action="store_true", help="Reject requests without the session cookie set on /")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each listing response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds added to the latency")
+    parser.add_argument("--density", type=float, default=None, help="Fraction of numbers with exactly --match-digits distinct digits")
+    parser.add_argument("--match-digits", type=int, default=3, help="Distinct digits of the numbers counted by --density")
+    parser.add_argument("--append", action="store_true", help="Append each batch on the page instead of replacing it")
+    args = parser.parse_args()
+
+    server = create_server(
+        args.port, args.batch_size, args.pages, args.seed, args.require_cookie, verbose=True,
+        latency=args.latency, jitter=args.jitter, density=args.density, match_digits=args.match_digits, append=args.append
+    )
+    print(f"Fixture server running on http://127.0.0.1:{args.port}/activation/choose-number")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping fixture server")
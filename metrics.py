@@ -0,0 +1,151 @@
+"""Lightweight timing and counter instrumentation for a search run.
+
+Metrics are only collected when METRICS_JSON_PATH or METRICS_PROM_PATH is set. Otherwise
+get_metrics() returns a NullMetrics whose methods do nothing, so instrumented code costs
+next to nothing. Snapshots are written at exit, and every METRICS_INTERVAL seconds if set.
+"""
+import atexit
+import contextlib
+import json
+import os
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+COUNTERS = ('batches', 'numbers_examined', 'matches', 'timeouts', 'errors')
+
+class Histogram:
+    """Cumulative latency histogram in the Prometheus style"""
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        for index, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[index] += 1
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0,
+            "max": round(self.max, 6),
+            "buckets": {str(bound): count for bound, count in zip(BUCKETS, self.bucket_counts)},
+        }
+
+class Metrics:
+    """Per-phase latency histograms and run counters"""
+
+    def __init__(self, json_path=None, prom_path=None, interval=0):
+        self.json_path = json_path
+        self.prom_path = prom_path
+        self.interval = interval
+        self.started = time.time()
+        self.last_export = time.monotonic()
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.histograms = {}
+
+    @contextlib.contextmanager
+    def time(self, phase):
+        """Time the body of a with block as one observation of phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    def observe(self, phase, seconds):
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            histogram = self.histograms[phase] = Histogram()
+        histogram.observe(seconds)
+
+    def inc(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self):
+        return {
+            "started": self.started,
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "counters": dict(self.counters),
+            "phases": {phase: histogram.snapshot() for phase, histogram in self.histograms.items()},
+        }
+
+    def prometheus_text(self):
+        lines = []
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE eight_{name}_total counter")
+            lines.append(f"eight_{name}_total {value}")
+        lines.append("# TYPE eight_phase_seconds histogram")
+        for phase, histogram in self.histograms.items():
+            for bound, count in zip(BUCKETS, histogram.bucket_counts):
+                lines.append(f'eight_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} {count}')
+            lines.append(f'eight_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {histogram.count}')
+            lines.append(f'eight_phase_seconds_sum{{phase="{phase}"}} {histogram.sum:.6f}')
+            lines.append(f'eight_phase_seconds_count{{phase="{phase}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        """Write the JSON snapshot and Prometheus text file"""
+        self.last_export = time.monotonic()
+        try:
+            if self.json_path:
+                write_atomically(self.json_path, json.dumps(self.snapshot(), indent=2))
+            if self.prom_path:
+                write_atomically(self.prom_path, self.prometheus_text())
+        except OSError as e:
+            print(f"Warning: Could not export metrics: {e}")
+
+    def maybe_export(self):
+        """Export if METRICS_INTERVAL seconds have passed since the last export"""
+        if self.interval and time.monotonic() - self.last_export >= self.interval:
+            self.export()
+
+class NullMetrics:
+    """Stand-in used when metrics are turned off"""
+
+    _timer = contextlib.nullcontext()
+
+    def time(self, phase):
+        return self._timer
+
+    def observe(self, phase, seconds):
+        pass
+
+    def inc(self, name, amount=1):
+        pass
+
+    def export(self):
+        pass
+
+    def maybe_export(self):
+        pass
+
+def write_atomically(path, text):
+    """Write a file so readers (e.g. a Prometheus textfile collector) never see half of it"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+_metrics = None
+
+def get_metrics():
+    """Return the metrics for this run, created on first use from the environment"""
+    global _metrics
+    if _metrics is None:
+        json_path = os.getenv('METRICS_JSON_PATH', '')
+        prom_path = os.getenv('METRICS_PROM_PATH', '')
+        if json_path or prom_path:
+            _metrics = Metrics(json_path, prom_path, float(os.getenv('METRICS_INTERVAL', 0)))
+            atexit.register(_metrics.export)
+        else:
+            _metrics = NullMetrics()
+    return _metrics
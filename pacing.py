@@ -0,0 +1,113 @@
+"""Adaptive pacing of "Show more numbers" clicks.
+
+With PACING_MODE=adaptive the click rate is controlled AIMD style (additive increase,
+multiplicative decrease): every healthy batch raises the rate by PACING_INCREASE clicks per
+minute, while a slow batch, a timeout or an error cuts it by PACING_DECREASE and a verification
+challenge drops it straight to PACING_MIN_RATE. Otherwise get_pacing() returns a NullPacing that
+never waits, which is the old behaviour.
+"""
+import os
+import time
+
+from metrics import get_metrics
+
+class PacingController:
+    """Spaces clicks 60 / rate seconds apart and adjusts the rate after each batch"""
+
+    def __init__(self, rate=20.0, min_rate=2.0, max_rate=120.0, increase=2.0, decrease=0.5, target_latency=2.0):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.last_click = None
+        self.decisions = {'increase': 0, 'decrease': 0, 'reset': 0}
+
+    @property
+    def interval(self):
+        """Seconds between clicks at the current rate"""
+        return 60 / self.rate
+
+    def wait(self):
+        """Sleep until the next click is allowed. Time spent extracting and scoring counts towards the wait."""
+        if self.last_click is not None:
+            remaining = self.interval - (time.monotonic() - self.last_click)
+            if remaining > 0:
+                with get_metrics().time('pacing_wait'):
+                    time.sleep(remaining)
+        self.last_click = time.monotonic()
+
+    def record_success(self, latency):
+        """A batch loaded; speed up if it loaded within PACING_TARGET_LATENCY, slow down if not"""
+        if latency > self.target_latency:
+            self._decrease(f"slow batch ({latency:.2f}s > {self.target_latency:g}s)")
+        else:
+            self._set_rate(self.rate + self.increase, 'increase', f"healthy batch ({latency:.2f}s)")
+
+    def record_timeout(self):
+        self._decrease("timed out waiting for numbers")
+
+    def record_error(self, error):
+        self._decrease(f"error ({error})")
+
+    def record_verification(self):
+        get_metrics().inc('verifications')
+        self._set_rate(self.min_rate, 'reset', "verification challenge")
+
+    def _decrease(self, reason):
+        self._set_rate(self.rate * self.decrease, 'decrease', reason)
+
+    def _set_rate(self, rate, decision, reason):
+        previous = self.rate
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+        self.decisions[decision] += 1
+        print(f"Pacing: {reason}, rate {previous:.1f} -> {self.rate:.1f} clicks/min ({self.interval:.2f}s apart)")
+
+    def summary(self):
+        return (f"Pacing ended at {self.rate:.1f} clicks/min after {self.decisions['increase']} increase(s), "
+                f"{self.decisions['decrease']} decrease(s) and {self.decisions['reset']} verification reset(s)")
+
+class NullPacing:
+    """Stand-in used when adaptive pacing is turned off"""
+
+    rate = None
+
+    def wait(self):
+        pass
+
+    def record_success(self, latency):
+        pass
+
+    def record_timeout(self):
+        pass
+
+    def record_error(self, error):
+        pass
+
+    def record_verification(self):
+        pass
+
+_pacing = None
+
+def get_pacing():
+    """Return the pacing controller for this run, created on first use from the environment"""
+    global _pacing
+    if _pacing is None:
+        if os.getenv('PACING_MODE', 'off').lower() == 'adaptive':
+            _pacing = PacingController(
+                rate=float(os.getenv('PACING_START_RATE', 20)),
+                min_rate=float(os.getenv('PACING_MIN_RATE', 2)),
+                max_rate=float(os.getenv('PACING_MAX_RATE', 120)),
+                increase=float(os.getenv('PACING_INCREASE', 2)),
+                decrease=float(os.getenv('PACING_DECREASE', 0.5)),
+                target_latency=float(os.getenv('PACING_TARGET_LATENCY', 2)),
+            )
+            print(f"Adaptive pacing on, starting at {_pacing.rate:.1f} clicks/min")
+        else:
+            _pacing = NullPacing()
+    return _pacing
+
+def get_active_pacing():
+    """Return the pacing controller if one has been created this run, without creating one"""
+    return _pacing if isinstance(_pacing, PacingController) else None
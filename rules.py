@@ -0,0 +1,241 @@
+"""Vanity number rules, compiled once and scored a whole batch at a time with NumPy.
+
+A rule spec is a comma-separated list of rules, each optionally followed by *weight:
+
+    distinct=3          exactly 3 distinct digits (also distinct>=N, distinct<=N)
+    run>=3              a run of at least 3 repeated digits (e.g. 888)
+    ascending>=4        at least 4 consecutive ascending digits (e.g. 1234)
+    descending>=4       at least 4 consecutive descending digits (e.g. 9876)
+    palindrome          reads the same backwards
+    prefix=88           starts with 88
+    suffix=00           ends with 00
+
+For example "distinct<=4*2,run>=3,palindrome*0.5". A number's score is the sum of the
+weights of the rules it meets, and it matches when the score reaches the minimum score
+(by default the total weight, i.e. every rule has to be met).
+"""
+import hashlib
+import os
+import re
+
+import numpy as np
+
+# Number of set bits for every 10-bit digit mask
+POPCOUNT = np.array([bin(mask).count('1') for mask in range(1 << 10)], dtype=np.int8)
+POWERS_OF_TEN = 10 ** np.arange(19, dtype=np.int64)
+# Numbers are scored as int64, and prefix/suffix values are compared against powers of ten up to 10^18
+MAX_NUMBER = int(np.iinfo(np.int64).max)
+MAX_AFFIX_DIGITS = 18
+
+def _chunk_masks(padded):
+    """Digit masks for every 4-digit chunk, with or without its leading zeros"""
+    masks = []
+    for chunk in range(10000):
+        mask = 0
+        for digit in (f"{chunk:04d}" if padded else str(chunk)):
+            mask |= 1 << int(digit)
+        masks.append(mask)
+    return np.array(masks, dtype=np.int16)
+
+# Precomputed digit masks, so the distinct count takes one lookup per 4 digits
+PADDED_CHUNK_MASKS = _chunk_masks(padded=True)
+LEADING_CHUNK_MASKS = _chunk_masks(padded=False)
+
+RULE_PATTERN = re.compile(
+    r'^(?P<name>distinct|run|ascending|descending|palindrome|prefix|suffix)'
+    r'(?:(?P<op>>=|<=|=)(?P<value>\d+))?'
+    r'(?:\*(?P<weight>\d+(?:\.\d+)?))?$'
+)
+COUNT_RULES = ('distinct', 'run', 'ascending', 'descending')
+OPERATORS = {
+    '=': np.equal,
+    '>=': np.greater_equal,
+    '<=': np.less_equal,
+}
+
+class Rule:
+    """A single rule and its weight"""
+
+    def __init__(self, name, op=None, value=None, weight=1.0):
+        self.name = name
+        self.op = op
+        self.value = value
+        self.weight = weight
+
+    def evaluate(self, features):
+        """Return a boolean array saying which numbers meet the rule"""
+        if self.name == 'palindrome':
+            return features.palindrome()
+        if self.name == 'prefix':
+            return features.has_prefix(self.value)
+        if self.name == 'suffix':
+            return features.has_suffix(self.value)
+        return OPERATORS[self.op](features.count(self.name), int(self.value))
+
+    def spec(self):
+        """The rule in canonical spec form, e.g. distinct=3*1"""
+        return f"{self.name}{self.op or ''}{self.value or ''}*{self.weight:g}"
+
+    def describe(self):
+        if self.name == 'palindrome':
+            text = "a palindrome"
+        elif self.name in ('prefix', 'suffix'):
+            text = f"{self.name} {self.value}"
+        else:
+            amount = {'=': 'exactly', '>=': 'at least', '<=': 'at most'}[self.op]
+            unit = {
+                'distinct': 'distinct digits',
+                'run': 'repeated digits in a row',
+                'ascending': 'ascending digits in a row',
+                'descending': 'descending digits in a row',
+            }[self.name]
+            text = f"{amount} {self.value} {unit}"
+        if self.weight != 1:
+            text += f" (weight {self.weight:g})"
+        return text
+
+class DigitFeatures:
+    """Digit features for a batch of numbers, each computed once on first use"""
+
+    def __init__(self, numbers):
+        values = np.asarray(numbers).reshape(-1)
+        if values.size and (values.dtype.kind not in 'iu' or values.min() < 0 or values.max() > MAX_NUMBER):
+            raise ValueError(f"Numbers must be whole numbers from 0 to {MAX_NUMBER}")
+        self.values = values.astype(np.int64)
+        self.lengths = np.searchsorted(POWERS_OF_TEN[1:], self.values, side='right') + 1
+        self.width = int(self.lengths.max()) if len(self.values) else 1
+        self.cache = {}
+        self._digits = None
+        self.valid = None
+
+    @property
+    def digits(self):
+        """Digits right-aligned, so the last column is always the units digit"""
+        if self._digits is None:
+            columns = POWERS_OF_TEN[self.width - 1::-1]
+            self._digits = ((self.values[:, None] // columns) % 10).astype(np.int8)
+            self.valid = np.arange(self.width) >= (self.width - self.lengths)[:, None]
+        return self._digits
+
+    def count(self, name):
+        if name not in self.cache:
+            if name == 'distinct':
+                self.cache[name] = self.distinct_count()
+            else:
+                step = {'run': 0, 'ascending': 1, 'descending': -1}[name]
+                self.cache[name] = self.longest_step_run(step)
+        return self.cache[name]
+
+    def distinct_count(self):
+        # Zero is the only number whose leading chunk has no digits
+        masks = np.where(self.values == 0, 1, 0).astype(np.int16)
+        for chunk_index in range((self.width + 3) // 4):
+            low = POWERS_OF_TEN[4 * chunk_index]
+            chunks = (self.values // low) % 10000
+            if 4 * chunk_index + 4 < len(POWERS_OF_TEN):
+                inner = self.values >= POWERS_OF_TEN[4 * chunk_index + 4]
+            else:
+                inner = np.zeros(len(self.values), dtype=bool)
+            leading = ~inner & (self.values >= low)
+            masks |= np.where(inner, PADDED_CHUNK_MASKS[chunks], 0).astype(np.int16)
+            masks |= np.where(leading, LEADING_CHUNK_MASKS[chunks], 0).astype(np.int16)
+        return POPCOUNT[masks]
+
+    def longest_step_run(self, step):
+        """Length of the longest run where every digit is the previous digit plus step"""
+        current = np.ones(len(self.values), dtype=np.int8)
+        longest = current.copy()
+        digits = self.digits
+        for column in range(1, self.width):
+            follows = (digits[:, column] - digits[:, column - 1] == step) & self.valid[:, column - 1]
+            current = np.where(follows, current + 1, 1).astype(np.int8)
+            np.maximum(longest, current, out=longest)
+        return longest
+
+    def palindrome(self):
+        digits = self.digits
+        rows = np.arange(len(self.values))
+        result = np.ones(len(self.values), dtype=bool)
+        for offset in range(self.width // 2):
+            left = digits[rows, np.clip(self.width - self.lengths + offset, 0, self.width - 1)]
+            right = digits[:, self.width - 1 - offset]
+            result &= (left == right) | (offset >= self.lengths // 2)
+        return result
+
+    def has_prefix(self, prefix):
+        shift = self.lengths - len(prefix)
+        leading = self.values // POWERS_OF_TEN[np.clip(shift, 0, 18)]
+        return (shift >= 0) & (leading == int(prefix))
+
+    def has_suffix(self, suffix):
+        return (self.lengths >= len(suffix)) & (self.values % POWERS_OF_TEN[len(suffix)] == int(suffix))
+
+class RuleSet:
+    """A compiled set of weighted rules"""
+
+    def __init__(self, rules, min_score=None):
+        if not rules:
+            raise ValueError("At least one rule is required")
+        self.rules = rules
+        self.total_weight = sum(rule.weight for rule in rules)
+        self.min_score = self.total_weight if min_score is None else min_score
+
+    def score_batch(self, numbers):
+        """Score a whole batch of numbers in one call. Returns a float array."""
+        features = DigitFeatures(numbers)
+        scores = np.zeros(len(features.values), dtype=np.float64)
+        for rule in self.rules:
+            scores += rule.weight * rule.evaluate(features)
+        return scores
+
+    def match_batch(self, numbers):
+        """Return a boolean array saying which numbers match"""
+        return self.score_batch(numbers) >= self.min_score
+
+    def score(self, number):
+        return float(self.score_batch([number])[0])
+
+    def matches(self, number):
+        return bool(self.match_batch([number])[0])
+
+    def key(self):
+        """Short hash identifying the rules and weights, so stored scores are only reused under the
+        same rules. The minimum score isn't part of it since it doesn't change any score."""
+        spec = ",".join(rule.spec() for rule in self.rules)
+        return hashlib.sha1(spec.encode()).hexdigest()[:12]
+
+    def describe(self):
+        text = " + ".join(rule.describe() for rule in self.rules)
+        if self.min_score != self.total_weight:
+            text += f" (score >= {self.min_score:g})"
+        return text
+
+def parse_rules(spec):
+    """Parse a rule spec such as "distinct=3,run>=3*0.5" into a list of rules"""
+    rules = []
+    for part in spec.replace(' ', '').split(','):
+        if not part:
+            continue
+        match = RULE_PATTERN.match(part)
+        if not match:
+            raise ValueError(f"Invalid rule: {part!r}")
+        name, op, value, weight = match.group('name', 'op', 'value', 'weight')
+        if name in COUNT_RULES and not op:
+            raise ValueError(f"Rule {part!r} needs a comparison, e.g. {name}>=3")
+        if name in ('prefix', 'suffix') and op != '=':
+            raise ValueError(f"Rule {part!r} needs a value, e.g. {name}=88")
+        if name in ('prefix', 'suffix') and len(value) > MAX_AFFIX_DIGITS:
+            raise ValueError(f"Rule {part!r} is longer than {MAX_AFFIX_DIGITS} digits")
+        if name == 'palindrome' and op:
+            raise ValueError(f"Rule {part!r} does not take a value")
+        rules.append(Rule(name, op, value, float(weight) if weight else 1.0))
+    return rules
+
+def compile_rules(spec=None, min_score=None):
+    """Compile a rule spec. Defaults to NUMBER_RULES and MIN_RULE_SCORE from the environment,
+    or exactly REQUIRED_DISTINCT_DIGITS distinct digits if NUMBER_RULES is not set."""
+    if spec is None:
+        spec = os.getenv('NUMBER_RULES') or f"distinct={int(os.getenv('REQUIRED_DISTINCT_DIGITS', 3))}"
+    if min_score is None and os.getenv('MIN_RULE_SCORE'):
+        min_score = float(os.getenv('MIN_RULE_SCORE'))
+    return RuleSet(parse_rules(spec), min_score)
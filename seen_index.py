@@ -0,0 +1,120 @@
+"""On-disk index of every number examined so far, kept in SQLite so it survives between runs.
+
+To see how much of the number pool has been covered:
+    python seen_index.py
+"""
+import os
+import sqlite3
+import time
+
+# SQLite limits the number of parameters in one query
+QUERY_CHUNK_SIZE = 500
+
+class SeenIndex:
+    """Numbers examined in this and earlier runs, with their score and first/last-seen times"""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_numbers (
+                number INTEGER PRIMARY KEY,
+                score REAL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                times_seen INTEGER NOT NULL DEFAULT 1,
+                rules TEXT
+            )
+        """)
+        # Indexes created before scores were tied to the rules that produced them
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(seen_numbers)")}
+        if 'rules' not in columns:
+            self.conn.execute("ALTER TABLE seen_numbers ADD COLUMN rules TEXT")
+        self.conn.commit()
+
+    def lookup(self, numbers, rules_key):
+        """Note that a batch was seen again. Returns the stored scores of the numbers scored under
+        rules_key (see RuleSet.key) and how many of the numbers were seen before under any rules."""
+        known = {}
+        for start in range(0, len(numbers), QUERY_CHUNK_SIZE):
+            chunk = numbers[start:start + QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(f"SELECT number, score, rules FROM seen_numbers WHERE number IN ({placeholders})", chunk)
+            known.update((number, (score, rules)) for number, score, rules in rows)
+
+        if known:
+            now = time.time()
+            self.conn.executemany(
+                "UPDATE seen_numbers SET last_seen = ?, times_seen = times_seen + 1 WHERE number = ?",
+                [(now, number) for number in known]
+            )
+            self.conn.commit()
+        scores = {number: score for number, (score, rules) in known.items() if rules == rules_key and score is not None}
+        return scores, len(known)
+
+    def filter_new(self, numbers, rules_key, min_score=None):
+        """Split a batch into the numbers still worth checking and how many were seen before.
+        A number is only dropped if it was scored under the same rules and that score is below
+        min_score, so earlier matches and numbers that may match changed rules are never lost."""
+        scores, seen_before = self.lookup(numbers, rules_key)
+        new_numbers = [
+            number for number in numbers
+            if number not in scores or (min_score is not None and scores[number] >= min_score)
+        ]
+        return new_numbers, seen_before
+
+    def record(self, numbers, scores, rules_key):
+        """Store examined numbers with their scores under rules_key. Sightings are counted by lookup."""
+        now = time.time()
+        self.conn.executemany(
+            """INSERT INTO seen_numbers (number, score, first_seen, last_seen, rules) VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(number) DO UPDATE SET
+                   score = excluded.score,
+                   rules = excluded.rules,
+                   last_seen = excluded.last_seen""",
+            [(int(number), float(score), now, now, rules_key) for number, score in zip(numbers, scores)]
+        )
+        self.conn.commit()
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM seen_numbers").fetchone()[0]
+
+    def coverage(self, pool_size):
+        """Return how many numbers have been seen and what fraction of the pool that is"""
+        seen = self.count()
+        return seen, seen / pool_size if pool_size else 0
+
+    def best(self, rules_key, limit=10):
+        """Return the highest-scoring numbers scored under rules_key as (number, score) pairs"""
+        return self.conn.execute(
+            "SELECT number, score FROM seen_numbers WHERE rules = ? ORDER BY score DESC, number LIMIT ?",
+            (rules_key, limit)
+        ).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+def get_pool_size():
+    """Size of the number pool, by default every 8-digit number starting with 8 or 9"""
+    return int(os.getenv('NUMBER_POOL_SIZE', 20000000))
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    from rules import compile_rules
+
+    load_dotenv()
+    path = os.getenv('SEEN_INDEX_PATH', 'seen_numbers.db')
+    if not path or not os.path.exists(path):
+        print(f"No seen-number index found at '{path}'")
+    else:
+        index = SeenIndex(path)
+        seen, fraction = index.coverage(get_pool_size())
+        print(f"Seen {seen:,} of {get_pool_size():,} possible numbers ({fraction:.4%})")
+        number_rules = compile_rules()
+        print(f"Best numbers for {number_rules.describe()}:")
+        for number, score in index.best(number_rules.key()):
+            print(f"{number} (score {score:g})")
+        index.close()
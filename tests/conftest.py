@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The modules live at the top of the repository rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the tests away from the real run's seen-number index, metrics, storage state and checkpoint
+os.environ.update(SEEN_INDEX_PATH='', METRICS_JSON_PATH='', METRICS_PROM_PATH='', STORAGE_STATE_PATH='', CHECKPOINT_PATH='')
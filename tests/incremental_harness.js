@@ -0,0 +1,101 @@
+// Runs the incremental extraction scripts from bryan.py against a minimal mock DOM.
+// Reads [DRAIN_NEW_NUMBERS_JS, HOLD_NEW_NUMBERS_JS, NEW_NUMBERS_PENDING_JS] as JSON on stdin
+// and prints the result of each step as JSON.
+const [DRAIN, HOLD, PENDING] = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+
+global.Node = {ELEMENT_NODE: 1, TEXT_NODE: 3};
+
+class Text {
+    constructor(data) { this.nodeType = 3; this.data = data; this.parentNode = null; }
+    get parentElement() { return this.parentNode; }
+}
+
+class Element {
+    constructor(tag, attrs = {}) { this.nodeType = 1; this.tag = tag; this.attrs = attrs; this.children = []; this.parentNode = null; }
+    get parentElement() { return this.parentNode; }
+    append(child) { child.parentNode = this; this.children.push(child); return child; }
+    // Matches div[orientation="horizontal"] button div.markdown, the only selector the scripts use
+    isMarkdown() {
+        if (this.tag !== 'div' || this.attrs.class !== 'markdown') return false;
+        let button = this.parentNode;
+        while (button && button.tag !== 'button') button = button.parentNode;
+        let container = button && button.parentNode;
+        while (container && !(container.tag === 'div' && container.attrs.orientation === 'horizontal')) container = container.parentNode;
+        return !!container;
+    }
+    closest() {
+        for (let element = this; element; element = element.parentNode) {
+            if (element.isMarkdown()) return element;
+        }
+        return null;
+    }
+    querySelectorAll() {
+        const found = [];
+        const walk = element => element.children.forEach(child => {
+            if (child.nodeType !== 1) return;
+            if (child.isMarkdown()) found.push(child);
+            walk(child);
+        });
+        walk(this);
+        return found;
+    }
+    get innerText() { return this.children.map(child => child.nodeType === 3 ? child.data : child.innerText).join(''); }
+}
+
+let observer;
+global.MutationObserver = class {
+    constructor(callback) { this.callback = callback; observer = this; }
+    observe() {}
+};
+const body = new Element('body');
+global.document = {body, querySelectorAll: selector => body.querySelectorAll(selector)};
+global.window = {};
+
+const drain = eval('(' + DRAIN + ')');
+const hold = eval('(' + HOLD + ')');
+const pending = eval('(' + PENDING + ')');
+
+const list = body.append(new Element('div', {orientation: 'horizontal'}));
+const addButton = number => {
+    const button = list.append(new Element('button'));
+    const markdown = button.append(new Element('div', {class: 'markdown'}));
+    const text = markdown.append(new Text(number));
+    observer && observer.callback([{type: 'childList', target: list, addedNodes: [button]}]);
+    return {button, markdown, text};
+};
+
+const steps = {};
+const first = ['80000001', '80000002'].map(addButton);
+steps.initial = drain();
+steps.pendingAfterDrain = pending();
+
+// The page re-renders a number that has already been read
+addButton('80000001');
+steps.pendingOnReadNumber = pending();
+
+// A number arrives between the drain and the click: it is held, not counted as the click's batch
+addButton('80000003');
+hold();
+steps.pendingAfterHold = pending();
+addButton('80000004');
+steps.pendingAfterClick = pending();
+steps.afterClick = drain();
+
+// In-place text updates
+first[0].text.data = '90000001';
+observer.callback([{type: 'characterData', target: first[0].text, addedNodes: []}]);
+steps.pendingOnTextChange = pending();
+steps.inPlace = drain();
+
+// Text elsewhere on the page is ignored
+const other = body.append(new Element('span'));
+const otherText = other.append(new Text('x'));
+observer.callback([{type: 'childList', target: other, addedNodes: [otherText]}]);
+steps.pendingOnUnrelated = pending();
+
+// A long session doesn't grow the remembered texts without bound
+for (let i = 0; i < 6000; i++) addButton(String(70000000 + i));
+steps.longSession = drain().length;
+steps.returnedSize = window.__eightNewNumbers.returned.size;
+
+console.log(JSON.stringify(steps));
@@ -0,0 +1,18 @@
+import json
+import os
+
+import bryan
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "choose_number_response.json")
+
+def test_fixture_payload_parses():
+    with open(FIXTURE) as f:
+        recorded = json.load(f)
+    assert bryan.parse_numbers_from_payload(recorded["payload"]) == [
+        84512376, 88818818, 90372158, 87654312, 88999889, 93128470, 81231231, 96027451,
+    ]
+
+def test_payload_keys_and_duplicates(monkeypatch):
+    monkeypatch.setenv('NUMBER_PAYLOAD_KEYS', 'msisdn')
+    payload = {"items": [{"msisdn": "8123-4567", "id": "99999999"}, {"msisdn": 81234567}, {"msisdn": True}]}
+    assert bryan.parse_numbers_from_payload(payload) == [81234567]
@@ -0,0 +1,62 @@
+import json
+
+import bryan
+
+class FakePage:
+    url = "http://fixture/choose-number"
+
+    def is_closed(self):
+        return False
+
+    def reload(self, **kwargs):
+        pass
+
+    def wait_for_selector(self, *args, **kwargs):
+        return True
+
+class FakeBrowser:
+    contexts = []
+
+    def is_connected(self):
+        return True
+
+class FakePlaywright:
+    class chromium:
+        @staticmethod
+        def connect_over_cdp(url):
+            return FakeBrowser()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+def test_match_served_again_after_reload_counts_once(monkeypatch, tmp_path):
+    monkeypatch.setenv('SEEN_INDEX_PATH', str(tmp_path / "seen.db"))
+    monkeypatch.setenv('TARGET_URL', FakePage.url)
+    monkeypatch.setenv('NUMBER_RULES', 'distinct=3')
+    monkeypatch.setattr(bryan, '_seen_index', None)
+    monkeypatch.setattr(bryan, '_number_rules', None)
+    monkeypatch.setattr(bryan, 'sync_playwright', FakePlaywright)
+    # Leave pytest's own Ctrl+C handling alone
+    monkeypatch.setattr(bryan.signal, 'signal', lambda signum, handler: None)
+    monkeypatch.setattr(bryan, 'wait_for_chrome_debugger', lambda: True)
+    monkeypatch.setattr(bryan, 'find_target_page', lambda browser: FakePage())
+    # Every reload serves the same batch, with one match in it
+    monkeypatch.setattr(bryan, 'iter_number_batches', lambda page, remaining: iter([[88812188, 81234567]]))
+
+    output = tmp_path / "daemon.jsonl"
+    writer = bryan.JsonlWriter(str(output))
+    try:
+        assert bryan.run_daemon(writer, max_batches=3, stop_after_matches=2, idle_wait=0) == 0
+    finally:
+        writer.close()
+        bryan.get_seen_index().close()
+
+    events = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [event["number"] for event in events if event["event"] == "match"] == [88812188]
+    summary = events[-1]
+    assert summary["reason"] == "max_batches"
+    assert summary["batches"] == 3
+    assert summary["matches"] == [88812188]
@@ -0,0 +1,43 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from bryan import DRAIN_NEW_NUMBERS_JS, HOLD_NEW_NUMBERS_JS, NEW_NUMBERS_PENDING_JS
+
+HARNESS = os.path.join(os.path.dirname(__file__), "incremental_harness.js")
+
+@pytest.fixture(scope="module")
+def steps():
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("node is not installed")
+    result = subprocess.run(
+        [node, HARNESS],
+        input=json.dumps([DRAIN_NEW_NUMBERS_JS, HOLD_NEW_NUMBERS_JS, NEW_NUMBERS_PENDING_JS]),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+def test_first_drain_reads_the_page(steps):
+    assert steps["initial"] == ["80000001", "80000002"]
+    assert not steps["pendingAfterDrain"]
+
+def test_numbers_already_read_are_not_pending(steps):
+    assert not steps["pendingOnReadNumber"]
+
+def test_wait_only_ends_on_numbers_brought_in_by_the_click(steps):
+    assert not steps["pendingAfterHold"]
+    assert steps["pendingAfterClick"]
+    assert steps["afterClick"] == ["80000003", "80000004"]
+
+def test_in_place_text_updates(steps):
+    assert steps["pendingOnTextChange"]
+    assert steps["inPlace"] == ["90000001"]
+    assert not steps["pendingOnUnrelated"]
+
+def test_remembered_texts_are_capped(steps):
+    assert steps["longSession"] == 6000
+    assert steps["returnedSize"] == 5000
@@ -0,0 +1,31 @@
+import pacing
+import bryan
+from pacing import PacingController, get_active_pacing
+
+class FakeButton:
+    def click(self):
+        pass
+
+class FakePage:
+    url = "http://fixture/choose-number"
+
+    def query_selector(self, selector):
+        return FakeButton()
+
+    def wait_for_selector(self, *args, **kwargs):
+        return True
+
+def test_no_active_pacing_until_created(monkeypatch):
+    monkeypatch.setattr(pacing, '_pacing', None)
+    assert get_active_pacing() is None
+    monkeypatch.setattr(pacing, '_pacing', pacing.NullPacing())
+    assert get_active_pacing() is None
+
+def test_sleep_mode_click_is_paced(monkeypatch):
+    controller = PacingController(rate=20, increase=2)
+    monkeypatch.setattr(pacing, '_pacing', controller)
+    monkeypatch.setenv('TARGET_URL', FakePage.url)
+    monkeypatch.setenv('LOAD_WAIT_TIME', '0')
+    assert bryan.click_show_more(FakePage(), mode='sleep')
+    assert controller.rate == 22
+    assert get_active_pacing() is controller
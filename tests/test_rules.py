@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+import pytest
+
+import bryan
+from rules import compile_rules, parse_rules, MAX_NUMBER
+
+def sample_numbers():
+    rng = random.Random(8)
+    numbers = list(range(0, 20000))
+    numbers += [rng.choice((8, 9)) * 10000000 + rng.randrange(10000000) for _ in range(20000)]
+    numbers += [rng.randrange(10 ** 18) for _ in range(2000)] + [MAX_NUMBER]
+    # Numbers with few distinct digits, long runs and palindromes are rare in random samples
+    numbers += [int("".join(rng.choice("889") for _ in range(8))) for _ in range(2000)]
+    numbers += [int(half + half[::-1]) for half in (str(rng.randrange(1, 10000)) for _ in range(1000))]
+    return numbers
+
+def longest_step_run(text, step):
+    longest = current = 1
+    for previous, digit in zip(text, text[1:]):
+        current = current + 1 if int(digit) - int(previous) == step else 1
+        longest = max(longest, current)
+    return longest
+
+NUMBERS = sample_numbers()
+
+@pytest.mark.parametrize("distinct", [1, 2, 3, 4, 8])
+def test_distinct_matches_legacy_check(monkeypatch, distinct):
+    monkeypatch.setenv('REQUIRED_DISTINCT_DIGITS', str(distinct))
+    expected = [bryan.has_exactly_three_distinct_digits(number) for number in NUMBERS]
+    assert compile_rules(f"distinct={distinct}").match_batch(NUMBERS).tolist() == expected
+
+@pytest.mark.parametrize("spec, reference", [
+    ("run>=3", lambda text: longest_step_run(text, 0) >= 3),
+    ("ascending>=4", lambda text: longest_step_run(text, 1) >= 4),
+    ("descending<=2", lambda text: longest_step_run(text, -1) <= 2),
+    ("palindrome", lambda text: text == text[::-1]),
+    ("prefix=88", lambda text: text.startswith("88")),
+    ("suffix=00", lambda text: text.endswith("00")),
+    ("distinct>=5", lambda text: len(set(text)) >= 5),
+])
+def test_rules_match_reference(spec, reference):
+    expected = [reference(str(number)) for number in NUMBERS]
+    assert compile_rules(spec).match_batch(NUMBERS).tolist() == expected
+
+def test_weighted_score_and_min_score():
+    rules = compile_rules("distinct<=4*2,run>=3,palindrome*0.5", min_score=2)
+    assert rules.score_batch([88899888, 81234567, 88888888]).tolist() == [3.5, 0.0, 3.5]
+    assert rules.match_batch([88812345, 88881212]).tolist() == [False, True]
+
+def test_rules_key_ignores_formatting_and_min_score():
+    assert compile_rules("distinct=3").key() == compile_rules(" distinct=3*1 ", min_score=0).key()
+    assert compile_rules("distinct=3").key() != compile_rules("distinct=2").key()
+
+@pytest.mark.parametrize("spec", ["distinct", "prefix>=8", "palindrome=1", "lucky=8", "prefix=" + "8" * 19, ""])
+def test_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        compile_rules(spec)
+
+def test_longest_supported_affix():
+    assert len(parse_rules("suffix=" + "0" * 18)) == 1
+    assert compile_rules("suffix=" + "0" * 18).match_batch([10 ** 18, 10 ** 17]).tolist() == [True, False]
+
+@pytest.mark.parametrize("numbers", [[2 ** 63], [2 ** 64], [-1], np.array([2 ** 63], dtype=np.uint64)])
+def test_out_of_range_numbers(numbers):
+    with pytest.raises(ValueError):
+        compile_rules("distinct=3").score_batch(numbers)
+
+def test_empty_batch():
+    assert compile_rules("distinct=3").score_batch([]).tolist() == []
@@ -0,0 +1,13 @@
+from bryan import TopNumbers
+
+def test_keeps_the_best_k():
+    top = TopNumbers(2)
+    assert top.offer(81111111, 1.0)
+    assert top.lowest_score() is None
+    assert top.offer(82222222, 3.0)
+    assert top.lowest_score() == 1.0
+    assert top.offer(83333333, 2.0)
+    assert not top.offer(84444444, 0.5)
+    assert not top.offer(82222222, 3.0)
+    assert top.ranked() == [(3.0, 82222222), (2.0, 83333333)]
+    assert top.lowest_score() == 2.0